@@ -0,0 +1,65 @@
+# Breath of the Wild Actor Tool, edits actor files fin LoZ:BotW
+# Copyright (C) 2020 GingerAvalanche (chodness@gmail.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Loads the full vanilla gamedata into a FlagStore, the same way BATActor.save
+# does, and reports how much memory the store holds on to.
+#
+#   python benchmarks/flag_memory.py [path/to/Bootup.pack]
+#
+# Without an argument, Bootup.pack is looked up through the tool's settings.
+
+import argparse
+import gc
+import time
+import tracemalloc
+from pathlib import Path
+
+from botw_actor_tool import util
+from botw_actor_tool.store import FLAG_MAPPING, FlagStore
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="FlagStore memory benchmark")
+    parser.add_argument("bootup", nargs="?", help="Bootup.pack to load gamedata from")
+    args = parser.parse_args()
+    bootup_path = (
+        Path(args.bootup) if args.bootup else Path(util.find_file(Path("Pack/Bootup.pack")))
+    )
+
+    # decompress the shards before tracing starts, only the store itself is measured
+    gamedata_sarc = util.BootupPack(bootup_path).get_gamedata_sarc()
+    bgdata = [(f.name, f.data) for f in gamedata_sarc.get_files()]
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    store = FlagStore()
+    for bgdata_name, bgdata_bytes in bgdata:
+        store.add_flags_from_bgdata_no_overwrite(bgdata_name, bytes(bgdata_bytes))
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    num_flags = sum(len(store.find_all_hashes(ftype, "")) for ftype in FLAG_MAPPING)
+    print(f"flags:   {num_flags}")
+    print(f"load:    {elapsed:.2f}s")
+    print(f"current: {current / 1024 / 1024:.1f} MiB ({current / max(num_flags, 1):.0f} B/flag)")
+    print(f"peak:    {peak / 1024 / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
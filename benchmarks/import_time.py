@@ -0,0 +1,82 @@
+# Breath of the Wild Actor Tool, edits actor files fin LoZ:BotW
+# Copyright (C) 2020 GingerAvalanche (chodness@gmail.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Imports each of the tool's core modules in a fresh interpreter, the way a
+# headless worker process does, and reports how long it takes. Fails if any of
+# them pulls in wxPython, which only the Ui_ modules should need.
+#
+#   python benchmarks/import_time.py [--runs N]
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+
+MODULES = [
+    "botw_actor_tool.actor",
+    "botw_actor_tool.actorinfo",
+    "botw_actor_tool.batch",
+    "botw_actor_tool.flag",
+    "botw_actor_tool.pack",
+    "botw_actor_tool.store",
+    "botw_actor_tool.texts",
+    "botw_actor_tool.util",
+]
+GUI_MODULES = ["wx"]
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed, ",".join(m for m in {gui_modules!r} if m in sys.modules))
+"""
+
+
+def time_import(module: str) -> tuple:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, gui_modules=GUI_MODULES)],
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    ).stdout.split()
+    return float(out[0]), out[1:]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Core module import time benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="imports to time per module")
+    args = parser.parse_args()
+
+    failed = False
+    for module in MODULES:
+        times = []
+        gui: list = []
+        for _ in range(args.runs):
+            elapsed, gui = time_import(module)
+            times.append(elapsed)
+        print(f"{module:28} {statistics.median(times) * 1000:7.1f} ms", end="")
+        if gui:
+            failed = True
+            print(f"  imports {', '.join(gui)}", end="")
+        print()
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
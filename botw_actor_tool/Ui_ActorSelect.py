@@ -17,7 +17,8 @@
 import wx
 
 from . import actorinfo
-from .util import BatSettings, _set_dark_mode
+from .Ui_Util import _set_dark_mode
+from .util import BatSettings
 
 
 class UiActorSelect(wx.Dialog):
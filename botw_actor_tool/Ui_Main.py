@@ -24,10 +24,10 @@ from .Ui_ActorLink import UiActorLinkPanel
 from .Ui_ActorSelect import UiActorSelect
 from .Ui_TextEditor import UiTextEditor
 from .Ui_Texts import UiTexts
+from .Ui_Util import _set_dark_mode
 from .util import (
     BatSettings,
     LINKS,
-    _set_dark_mode,
     find_file,
 )
 
@@ -18,6 +18,7 @@ import wx
 from pathlib import Path
 
 from . import util
+from .Ui_Util import _set_dark_mode
 
 
 class UiSettingsPanel(wx.Dialog):
@@ -30,7 +31,7 @@ class UiSettingsPanel(wx.Dialog):
         self._settings = util.BatSettings()
         self._ctrls = {}
         self.InitUI()
-        util._set_dark_mode(self, self._settings.get_dark_mode())
+        _set_dark_mode(self, self._settings.get_dark_mode())
 
     def InitUI(self):
         panelbox = wx.BoxSizer(wx.VERTICAL)
@@ -88,6 +89,41 @@ class UiSettingsPanel(wx.Dialog):
 
         panelbox.AddSpacer(10)
 
+        yaz0box = wx.BoxSizer(wx.HORIZONTAL)
+        yaz0text = wx.StaticText(self, label="Compression", size=(100, -1))
+        yaz0ctrl = wx.Choice(self, choices=[*util.YAZ0_MODES])
+        yaz0ctrl.SetSelection([*util.YAZ0_MODES].index(self._settings.get_yaz0_mode()))
+        self._ctrls["yaz0_mode"] = yaz0ctrl
+        yaz0box.Add(yaz0text, flag=wx.ALIGN_CENTER_VERTICAL)
+        yaz0box.Add(yaz0ctrl)
+        panelbox.Add(yaz0box, flag=wx.EXPAND | wx.LEFT | wx.RIGHT, border=10)
+
+        panelbox.AddSpacer(10)
+
+        workersbox = wx.BoxSizer(wx.HORIZONTAL)
+        workerstext = wx.StaticText(self, label="Save Workers", size=(100, -1))
+        workersctrl = wx.SpinCtrl(
+            self, min=1, max=64, initial=self._settings.get_save_workers()
+        )
+        self._ctrls["save_workers"] = workersctrl
+        workersbox.Add(workerstext, flag=wx.ALIGN_CENTER_VERTICAL)
+        workersbox.Add(workersctrl)
+        panelbox.Add(workersbox, flag=wx.EXPAND | wx.LEFT | wx.RIGHT, border=10)
+
+        panelbox.AddSpacer(10)
+
+        gdworkersbox = wx.BoxSizer(wx.HORIZONTAL)
+        gdworkerstext = wx.StaticText(self, label="Gamedata Workers", size=(100, -1))
+        gdworkersctrl = wx.SpinCtrl(
+            self, min=1, max=64, initial=self._settings.get_gamedata_workers()
+        )
+        self._ctrls["gamedata_workers"] = gdworkersctrl
+        gdworkersbox.Add(gdworkerstext, flag=wx.ALIGN_CENTER_VERTICAL)
+        gdworkersbox.Add(gdworkersctrl)
+        panelbox.Add(gdworkersbox, flag=wx.EXPAND | wx.LEFT | wx.RIGHT, border=10)
+
+        panelbox.AddSpacer(10)
+
         checkboxbox = wx.BoxSizer(wx.HORIZONTAL)
         darkmodebox = wx.CheckBox(self, label="Dark Mode")
         darkmodebox.SetValue(self._settings.get_dark_mode())
@@ -143,7 +179,7 @@ class UiSettingsPanel(wx.Dialog):
 
     def OnDarkMode(self, e) -> None:
         checked = e.GetEventObject().GetValue()
-        util._set_dark_mode(self, checked)
+        _set_dark_mode(self, checked)
 
     def OnAccept(self, e) -> None:
         game_dir = self._ctrls["game_dir"].GetValue()
@@ -177,6 +213,11 @@ class UiSettingsPanel(wx.Dialog):
         self._settings.set_setting(
             "lang", util.LANGUAGES[self._ctrls["lang"].GetCurrentSelection()]
         )
+        self._settings.set_yaz0_mode(
+            [*util.YAZ0_MODES][self._ctrls["yaz0_mode"].GetCurrentSelection()]
+        )
+        self._settings.set_save_workers(self._ctrls["save_workers"].GetValue())
+        self._settings.set_gamedata_workers(self._ctrls["gamedata_workers"].GetValue())
         self._settings.set_dark_mode(self._ctrls["dark"].GetValue())
         self._settings.save_settings()
         self.Close()
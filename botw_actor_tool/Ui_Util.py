@@ -0,0 +1,71 @@
+# Breath of the Wild Actor Tool, edits actor files fin LoZ:BotW
+# Copyright (C) 2020 GingerAvalanche (chodness@gmail.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import wx
+import wx.stc
+
+
+def _set_dark_mode(window: wx.Window, enabled: bool) -> None:
+    if enabled:
+        bg = wx.Colour(40, 40, 40)
+        fg = wx.Colour(255, 255, 255)
+    else:
+        bg = wx.NullColour
+        fg = wx.NullColour
+    window.SetBackgroundColour(bg)
+    window.SetForegroundColour(fg)
+    for child in window.Children:
+        if isinstance(child, wx.stc.StyledTextCtrl):
+            set_stc_dark_mode(child, enabled)
+        else:
+            _set_dark_mode(child, enabled)
+    window.Refresh()
+
+
+def set_stc_dark_mode(stc: wx.stc.StyledTextCtrl, enabled: bool) -> None:
+    if enabled:
+        default = "fore:#FFFFFF"
+        line = "fore:#FFFFFF"
+        comment = "fore:#00FF00"
+        identifier = "fore:#FF0000"
+        keyword = "fore:#FFFFFF"
+        number = "fore:#FFBBBB"
+        bg = "back:#202020"
+        caret = wx.Colour(255, 255, 255)
+    else:
+        default = "fore:#000000"
+        line = "fore:#000000"
+        comment = "fore:#FF00FF"
+        identifier = "fore:#2020FF"
+        keyword = "fore:#000000"
+        number = "fore:005555"
+        bg = "back:#FFFFFF"
+        caret = wx.Colour(0, 0, 0)
+    face = "face:Consolas"
+    stc.SetLexer(wx.stc.STC_LEX_YAML)
+    stc.StyleSetSpec(wx.stc.STC_STYLE_DEFAULT, f"{default},{bg},{face}")
+    stc.StyleSetSpec(wx.stc.STC_STYLE_LINENUMBER, f"{line},{bg},{face}")
+    stc.StyleSetSpec(wx.stc.STC_YAML_DEFAULT, f"{default},{bg},{face}")
+    stc.StyleSetSpec(wx.stc.STC_YAML_COMMENT, f"{comment},{bg},{face}")
+    stc.StyleSetSpec(wx.stc.STC_YAML_IDENTIFIER, f"bold,{identifier},{bg},{face}")
+    stc.StyleSetSpec(wx.stc.STC_YAML_KEYWORD, f"{keyword},{bg},{face}")
+    stc.StyleSetSpec(wx.stc.STC_YAML_NUMBER, f"bold,{number},{bg},{face}")
+    stc.StyleSetSpec(wx.stc.STC_YAML_REFERENCE, f"{default},{bg},{face}")
+    stc.StyleSetSpec(wx.stc.STC_YAML_DOCUMENT, f"{default},{bg},{face}")
+    stc.StyleSetSpec(wx.stc.STC_YAML_TEXT, f"{default},{bg},{face}")
+    stc.StyleSetSpec(wx.stc.STC_YAML_ERROR, f"{default},{bg},{face}")
+    stc.StyleSetSpec(wx.stc.STC_YAML_OPERATOR, f"{default},{bg},{face}")
+    stc.SetCaretForeground(caret)
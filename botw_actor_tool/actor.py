@@ -17,13 +17,13 @@
 import oead
 import shutil
 from pathlib import Path
-from typing import Dict, List, Union
-from zlib import crc32
+from typing import Dict, List, Optional, Tuple, Union
 
 from . import actorinfo, generic_link_files, util
-from .flag import BoolFlag, S32Flag
+from .flag import BFUFlag, BoolFlag, S32Flag
 from .pack import ActorPack
-from .texts import ActorTexts
+from .texts import ActorTexts, MessageTransaction
+from .snapshot import GamedataSnapshot
 from .store import FlagStore
 
 
@@ -32,6 +32,8 @@ FAR_LINKS: List[str] = [
     "ModelUser",
     "PhysicsUser",
 ]
+# save payloads that aren't worth keeping in the Yaz0 cache
+VOLATILE_PAYLOADS = {"gamedata", "savedata"}
 FLAG_CLASSES: Dict[str, type] = {
     "_DispNameFlag": BoolFlag,
     "EquipTime_": S32Flag,
@@ -112,25 +114,19 @@ class BATActor:
 
         if not actorinfo_path.exists():
             actorinfo_path = Path(util.find_file(Path("Actor/ActorInfo.product.sbyml")))
-        actorinfo = oead.byml.from_binary(oead.yaz0.decompress(actorinfo_path.read_bytes()))
-        info_set = far_info_set = False
-        for actor in actorinfo["Actors"]:
-            if actor["name"] == self._origname:
-                self._info = actor
-                info_set = True
-            if self._has_far:
-                if actor["name"] == self._far_pack.get_name():
-                    self._far_info = actor
-                    far_info_set = True
-            if info_set and (far_info_set or not self._has_far):
-                break
-        del actorinfo
+        index = actorinfo.ActorInfoIndex(actorinfo_path)
+        info = index.get_info(self._origname)
+        far_info = index.get_info(self._far_origname) if self._has_far else None
+        del index
         del actorinfo_path
 
-        if not self._info or (self._has_far and not self._far_info):
+        if info is None or (self._has_far and far_info is None):
             raise RuntimeError(
                 f"ActorInfo.product.sbyml did not contain an info entry for {self._origname}"
             )
+        self._info = info
+        if self._has_far:
+            self._far_info = far_info
 
     def get_name(self) -> str:
         return self._pack.get_name()
@@ -223,8 +219,8 @@ class BATActor:
     def get_texts(self) -> Dict[str, str]:
         return self._texts.get_texts()
 
-    def set_texts(self, texts: Dict[str, str]) -> None:
-        self._texts.set_texts(texts)
+    def set_texts(self, texts: Dict[str, str], lang: Optional[str] = None) -> None:
+        self._texts.set_texts(texts, lang)
 
     def set_flags(self, name: str) -> None:
         for ftype, hashes in self._flag_hashes.items():
@@ -247,87 +243,204 @@ class BATActor:
                 flag.use_name_to_override_params()
                 self._flags.add(ftype, flag)
 
-    def save(self, root_dir: str, be: bool) -> None:
-        if self._resident:
-            titlebg_path = Path(f"{root_dir}/Pack/TitleBG.pack")
-            actor_dir = f"Actor/Pack/{self._pack.get_name()}.sbactorpack"
-            if not titlebg_path.exists():
-                titlebg_path.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy(util.find_file(Path("Pack/TitleBG.pack")), titlebg_path)
-            yaz0_bytes = oead.yaz0.compress(self._pack.get_bytes(be))
-            util.inject_bytes_into_sarc(titlebg_path, actor_dir, yaz0_bytes)
-        else:
-            actor_path = Path(f"{root_dir}/Actor/Pack/{self._pack.get_name()}.sbactorpack")
-            yaz0_bytes = oead.yaz0.compress(self._pack.get_bytes(be))
-            if not actor_path.exists():
-                actor_path.parent.mkdir(parents=True, exist_ok=True)
-                actor_path.touch()
-            actor_path.write_bytes(yaz0_bytes)
-
-        hash = crc32(self._pack.get_name().encode("utf-8"))
-        info = self.get_info()
-
-        if self._has_far:
-            actor_path = Path(f"{root_dir}/Actor/Pack/{self._far_pack.get_name()}.sbactorpack")
-            yaz0_bytes = oead.yaz0.compress(self._far_pack.get_bytes(be))
-            if not actor_path.exists():
-                actor_path.touch()
-            actor_path.write_bytes(yaz0_bytes)
-
-            far_hash = crc32(self._far_pack.get_name().encode("utf-8"))
-            far_info = self.get_far_info()
-
-        actorinfo_path = Path(f"{root_dir}/Actor/ActorInfo.product.sbyml")
-        actorinfo_load_path = actorinfo_path
-        if not actorinfo_load_path.exists():
-            actorinfo_load_path.touch()
-            actorinfo_load_path = Path(util.find_file(Path("Actor/ActorInfo.product.sbyml")))
-        actorinfo = oead.byml.from_binary(oead.yaz0.decompress(actorinfo_load_path.read_bytes()))
-
-        hashes = [int(h) for h in actorinfo["Hashes"]]
-        try:
-            hash_index = hashes.index(hash)
-        except ValueError:
-            hashes.append(hash)
-            hashes.sort()
-            hash_index = hashes.index(hash)
-            actorinfo["Actors"].insert(hash_index, oead.byml.Hash())
+    def get_output(
+        self, be: bool, compression: Optional[str] = None, workers: Optional[int] = None
+    ) -> "ActorOutput":
+        """Builds everything this actor puts into a mod, see SaveTransaction.add_output"""
+        packs = {self._pack.get_name(): self._pack.get_bytes(be)}
         if self._has_far:
-            try:
-                far_hash_index = hashes.index(far_hash)
-            except ValueError:
-                hashes.append(far_hash)
-                hashes.sort()
-                far_hash_index = hashes.index(far_hash)
-                actorinfo["Actors"].insert(far_hash_index, oead.byml.Hash())
-        actorinfo["Hashes"] = oead.byml.Array(
-            [oead.U32(h) if h > 2147483647 else oead.S32(h) for h in hashes]
+            packs[self._far_pack.get_name()] = self._far_pack.get_bytes(be)
+        output = ActorOutput(self.get_name(), self._resident)
+        output.packs = dict(
+            zip(packs.keys(), util.compress_all(list(packs.values()), compression, workers))
+        )
+        infos = [self.get_info()] + ([self.get_far_info()] if self._has_far else [])
+        output.infos = [bytes(oead.byml.to_binary(info, False)) for info in infos]
+        output.flags = [
+            (ftype, self._flags.find(ftype, hash).copy())
+            for ftype, hashes in self._flag_hashes.items()
+            for hash in sorted(hashes)
+        ]
+        output.texts = [
+            (lang, *self._texts.get_message_entries(lang)) for lang in self._texts.get_languages()
+        ]
+        return output
+
+    def save(
+        self,
+        root_dir: str,
+        be: bool,
+        info_transaction: Optional[actorinfo.ActorInfoTransaction] = None,
+        compression: Optional[str] = None,
+        workers: Optional[int] = None,
+    ) -> None:
+        transaction = SaveTransaction(root_dir, be, compression, workers, info_transaction)
+        transaction.add(self)
+        transaction.commit()
+
+
+class ActorOutput:
+    """
+    Everything one actor puts into a mod, built and compressed: its packs by
+    actor name, its ActorInfo entries as byml, its flags by flag type, and its
+    texts as (language, msbt, entries). All of it can be pickled, so actors
+    can be built in other processes.
+    """
+
+    name: str
+    resident: bool
+    packs: Dict[str, bytes]
+    infos: List[bytes]
+    flags: List[Tuple[str, BFUFlag]]
+    texts: List[Tuple[str, str, Dict[str, str]]]
+
+    def __init__(self, name: str, resident: bool) -> None:
+        self.name = name
+        self.resident = resident
+        self.packs = {}
+        self.infos = []
+        self.flags = []
+        self.texts = []
+
+
+class SaveTransaction:
+    """
+    Saves any number of actors into one mod root. Each actor's packs are
+    written when it's added, and the files the actors share (ActorInfo, the
+    message packs, the gamedata and savedata in Bootup.pack, and TitleBG.pack
+    for resident actors) are built from all of them and written once when
+    committed. Used as a context manager, it commits on a clean exit.
+    """
+
+    _root_dir: str
+    _be: bool
+    _compression: str
+    _workers: Optional[int]
+    _info: actorinfo.ActorInfoTransaction
+    _own_info: bool
+    _messages: MessageTransaction
+    _flags: FlagStore
+    _resident_packs: Dict[str, bytes]
+    _count: int
+
+    def __init__(
+        self,
+        root_dir: str,
+        be: bool,
+        compression: Optional[str] = None,
+        workers: Optional[int] = None,
+        info_transaction: Optional[actorinfo.ActorInfoTransaction] = None,
+    ) -> None:
+        """
+        If info_transaction is given, the ActorInfo entries go into it, and it's
+        up to the caller to commit it
+        """
+        self._root_dir = root_dir
+        self._be = be
+        self._compression = compression or util.BatSettings().get_yaz0_mode()
+        self._workers = workers
+        self._own_info = info_transaction is None
+        self._info = info_transaction or actorinfo.ActorInfoTransaction(
+            root_dir, be, self._compression
         )
+        self._messages = MessageTransaction(root_dir, be, self._compression)
+        self._flags = FlagStore()
+        self._resident_packs = {}
+        self._count = 0
 
-        actorinfo["Actors"][hash_index] = info
-        if self._has_far:
-            actorinfo["Actors"][far_hash_index] = far_info
+    def __enter__(self) -> "SaveTransaction":
+        return self
 
-        actorinfo_path.write_bytes(oead.yaz0.compress(oead.byml.to_binary(actorinfo, be)))
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        if exc_type is None:
+            self.commit()
+        return False
 
-        self._texts.write(root_dir, be)
+    def add(self, actor: BATActor) -> None:
+        self.add_output(actor.get_output(self._be, self._compression, self._workers))
+
+    def add_output(self, output: ActorOutput) -> None:
+        """Writes an actor's packs and queues the rest of what it puts into the mod"""
+        for name, data in output.packs.items():
+            if output.resident and name == output.name:
+                self._resident_packs[f"Actor/Pack/{name}.sbactorpack"] = data
+                continue
+            actor_path = Path(f"{self._root_dir}/Actor/Pack/{name}.sbactorpack")
+            actor_path.parent.mkdir(parents=True, exist_ok=True)
+            actor_path.write_bytes(data)
+        for info in output.infos:
+            self._info.add_info(oead.byml.from_binary(info))
+        for ftype, flag in output.flags:
+            self._flags.add(ftype, flag)
+        for lang, msbt_name, entries in output.texts:
+            self._messages.add_entries(lang, msbt_name, entries)
+        self._count += 1
+
+    def commit(self) -> None:
+        if not self._count:
+            return
+        root_dir = self._root_dir
+        compression = self._compression
+
+        # build every payload first, so the (independent) compression jobs can
+        # run side by side before the files are written out in order
+        payloads: Dict[str, bytes] = {}
+        if self._own_info:
+            actorinfo_bytes = self._info.build()
+            if actorinfo_bytes is not None:
+                payloads["actorinfo"] = actorinfo_bytes
+        for lang, message_bytes in self._messages.build().items():
+            payloads[f"message_{lang}"] = message_bytes
 
         bootup_path = Path(f"{root_dir}/Pack/Bootup.pack")
         if not bootup_path.exists():
             bootup_path.parent.mkdir(parents=True, exist_ok=True)
             shutil.copy(util.find_file(Path("Pack/Bootup.pack")), bootup_path)
 
-        gamedata_sarc = util.get_gamedata_sarc(bootup_path)
-        for bgdata_name, bgdata_hash in map(util.unpack_oead_file, gamedata_sarc.get_files()):
-            self._flags.add_flags_from_Hash_no_overwrite(bgdata_name, bgdata_hash)
-
-        files_to_write: list = []
-        files_to_write.append("GameData/gamedata.ssarc")
-        files_to_write.append("GameData/savedataformat.ssarc")
-        orig_files = util.get_last_two_savedata_files(bootup_path)
-        datas_to_write: list = []
-        datas_to_write.append(oead.yaz0.compress(util.make_new_gamedata(self._flags, be)))
-        datas_to_write.append(
-            oead.yaz0.compress(util.make_new_savedata(self._flags, be, orig_files))
+        bootup = util.BootupPack(bootup_path)
+        self._flags.add_flags_from_snapshot_no_overwrite(
+            GamedataSnapshot.for_bootup(bootup, self._workers)
         )
-        util.inject_files_into_bootup(bootup_path, files_to_write, datas_to_write)
+        savedata_files = bootup.get_savedata_files()
+        snapshot_files: list = []
+        payloads["gamedata"] = util.make_new_gamedata(
+            self._flags, self._be, snapshot_files, self._workers
+        )
+        payloads["savedata"] = util.make_new_savedata(
+            self._flags, self._be, savedata_files[-2:], savedata_files[:-2]
+        )
+
+        # gamedata and savedata come out different after almost every change, so
+        # they'd only push reusable blobs out of the Yaz0 cache
+        compressed = dict(
+            zip(
+                payloads.keys(),
+                util.compress_all(
+                    list(payloads.values()),
+                    compression,
+                    self._workers,
+                    [not key in VOLATILE_PAYLOADS for key in payloads],
+                ),
+            )
+        )
+        del payloads
+
+        if self._resident_packs:
+            titlebg_path = Path(f"{root_dir}/Pack/TitleBG.pack")
+            if not titlebg_path.exists():
+                titlebg_path.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy(util.find_file(Path("Pack/TitleBG.pack")), titlebg_path)
+            util.inject_files_into_sarc(titlebg_path, self._resident_packs, compression)
+
+        if "actorinfo" in compressed:
+            self._info.write(compressed["actorinfo"])
+
+        for key, data in compressed.items():
+            if key.startswith("message_"):
+                self._messages.write(key[len("message_") :], data)
+
+        bootup.set_file("GameData/gamedata.ssarc", compressed["gamedata"])
+        bootup.set_file("GameData/savedataformat.ssarc", compressed["savedata"])
+        bootup.write(compression)
+        # so the next save doesn't have to compile the gamedata this one wrote
+        GamedataSnapshot(util.BootupPack.digest(compressed["gamedata"]), snapshot_files).keep()
@@ -22,14 +22,18 @@
 # also means that this might be incredibly difficult to read.
 
 import oead
+import os
 import zlib
+from bisect import bisect_left
 from ctypes import c_int32
-from json import loads
+from hashlib import sha1
+from json import dumps, loads
 from math import isclose
 from pathlib import Path
-from typing import Union
+from typing import Dict, List, Optional, Union
 
 from . import EXEC_DIR, util
+from .bymlreader import ActorInfoReader
 from .pack import ActorPack
 
 KEYS_BY_PROFILE = loads((EXEC_DIR / "data/keys_by_profile.json").read_bytes())["keys_per_profile"]
@@ -339,14 +343,149 @@ def _deepretrieve_info(
                 raise TypeError(f"{param}")
 
 
+class ActorInfoIndex:
+    """
+    Persistent name -> info entry index for an ActorInfo.product.sbyml file.
+    Every entry is stored as its own little BYML document in a blob in the
+    data dir, so looking up one actor never parses the whole ActorInfo.
+    The index is stamped with the source path, size and mtime and gets
+    rebuilt whenever the source file changes.
+    """
+
+    _source: Path
+    _index_path: Path
+    _blob_path: Path
+    _entries: Dict[str, List[int]]
+
+    def __init__(self, actorinfo_path: Path) -> None:
+        self._source = actorinfo_path.resolve()
+        index_dir = util.BatSettings().get_data_dir() / "actorinfo_index"
+        index_dir.mkdir(parents=True, exist_ok=True)
+        key = sha1(str(self._source).encode("utf-8")).hexdigest()
+        self._index_path = index_dir / f"{key}.json"
+        self._blob_path = index_dir / f"{key}.bin"
+        stat = self._source.stat()
+        stamp = {"source": str(self._source), "size": stat.st_size, "mtime": stat.st_mtime_ns}
+        try:
+            index = loads(self._index_path.read_text(encoding="utf-8"))
+            if index["stamp"] == stamp and self._blob_path.exists():
+                self._entries = index["actors"]
+                return
+        except (FileNotFoundError, KeyError, ValueError):
+            pass
+        self._rebuild(stamp)
+
+    def _rebuild(self, stamp: dict) -> None:
+        # oead parses the whole file faster than ActorInfoReader can walk it entry by entry
+        actors = oead.byml.from_binary(util.unyaz_if_needed(self._source.read_bytes()))["Actors"]
+        self._entries = {}
+        tmp_blob = self._blob_path.with_suffix(f".bin.{os.getpid()}.tmp")
+        with tmp_blob.open("wb") as blob:
+            for actor in actors:
+                data = oead.byml.to_binary(actor, False)
+                self._entries[str(actor["name"])] = [blob.tell(), len(data)]
+                blob.write(data)
+        del actors
+        os.replace(tmp_blob, self._blob_path)
+        tmp_index = self._index_path.with_suffix(f".json.{os.getpid()}.tmp")
+        tmp_index.write_text(dumps({"stamp": stamp, "actors": self._entries}), encoding="utf-8")
+        os.replace(tmp_index, self._index_path)
+
+    def get_info(self, name: str) -> Optional[oead.byml.Hash]:
+        if not name in self._entries:
+            return None
+        offset, size = self._entries[name]
+        with self._blob_path.open("rb") as blob:
+            blob.seek(offset)
+            return oead.byml.from_binary(blob.read(size))
+
+
+class ActorInfoTransaction:
+    """
+    Collects the info entries of any number of actors and merges them into a
+    mod's ActorInfo.product.sbyml with one read-modify-write when committed.
+    Used as a context manager, it commits on a clean exit.
+    """
+
+    _root_dir: str
+    _be: bool
+    _compression: Optional[str]
+    _entries: Dict[int, oead.byml.Hash]
+
+    def __init__(self, root_dir: str, be: bool, compression: Optional[str] = None) -> None:
+        self._root_dir = root_dir
+        self._be = be
+        self._compression = compression
+        self._entries = {}
+
+    def __enter__(self) -> "ActorInfoTransaction":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        if exc_type is None:
+            self.commit()
+        return False
+
+    def add(self, actor) -> None:
+        """Queues the info entries of a BATActor, including its far actor if it has one"""
+        self.add_info(actor.get_info())
+        if actor.get_has_far():
+            self.add_info(actor.get_far_info())
+
+    def add_info(self, info: oead.byml.Hash) -> None:
+        self._entries[zlib.crc32(str(info["name"]).encode("utf-8"))] = info
+
+    def commit(self) -> None:
+        data = self.build()
+        if data is not None:
+            self.write(util.compress(data, self._compression))
+
+    def build(self) -> Optional[bytes]:
+        """
+        Merges the queued entries and returns the new, uncompressed ActorInfo,
+        or None if nothing was queued. Pass the compressed result to write().
+        """
+        if not self._entries:
+            return None
+        actorinfo_path = Path(f"{self._root_dir}/Actor/ActorInfo.product.sbyml")
+        actorinfo_load_path = actorinfo_path
+        if not actorinfo_load_path.exists():
+            actorinfo_path.parent.mkdir(parents=True, exist_ok=True)
+            actorinfo_load_path = Path(util.find_file(Path("Actor/ActorInfo.product.sbyml")))
+        actorinfo = oead.byml.from_binary(oead.yaz0.decompress(actorinfo_load_path.read_bytes()))
+
+        old_hashes = [int(h) for h in actorinfo["Hashes"]]
+        old_actors = actorinfo["Actors"]
+        hashes: List[int] = []
+        actors: list = []
+        start = 0
+        for hash in sorted(self._entries):
+            idx = bisect_left(old_hashes, hash, start)
+            hashes.extend(old_hashes[start:idx])
+            actors.extend(old_actors[i] for i in range(start, idx))
+            hashes.append(hash)
+            actors.append(self._entries[hash])
+            start = idx + 1 if idx < len(old_hashes) and old_hashes[idx] == hash else idx
+        hashes.extend(old_hashes[start:])
+        actors.extend(old_actors[i] for i in range(start, len(old_hashes)))
+
+        actorinfo["Hashes"] = oead.byml.Array(
+            [oead.U32(h) if h > 2147483647 else oead.S32(h) for h in hashes]
+        )
+        actorinfo["Actors"] = oead.byml.Array(actors)
+        self._entries.clear()
+        return bytes(oead.byml.to_binary(actorinfo, self._be))
+
+    def write(self, data: bytes) -> None:
+        Path(f"{self._root_dir}/Actor/ActorInfo.product.sbyml").write_bytes(data)
+
+
 def get_all_actors(path: str) -> list:
     actorlist = []
     update_dir = util.BatSettings().get_setting("update_dir")
     if path == update_dir:
         actorinfo_path = Path(f"{path}/Actor/ActorInfo.product.sbyml")
-        actorinfo = oead.byml.from_binary(oead.yaz0.decompress(actorinfo_path.read_bytes()))
-        for aiactor in actorinfo["Actors"]:
-            actorlist.append(str(aiactor["name"]))
+        actorlist.extend(ActorInfoReader.from_file(actorinfo_path).iter_names())
     else:
         for actor in [actor.stem for actor in Path(path).glob("Actor/Pack/*.sbactorpack")]:
             actorlist.append(actor)
@@ -0,0 +1,208 @@
+# Breath of the Wild Actor Tool, edits actor files fin LoZ:BotW
+# Copyright (C) 2020 GingerAvalanche (chodness@gmail.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Builds actors from a job file without the GUI. A job file is JSON or TOML with
+# a list of jobs, each one cloning a base actor under a new name:
+#
+#   output = "path/to/mod/romfs"
+#
+#   [[jobs]]
+#   base = "Armor_001_Upper"
+#   name = "Armor_900_Upper"
+#   tags = ["ArmorUpper"]
+#   links = { ModelUser = "Armor_900" }
+#   texts.USen = { Name = "New Tunic", Desc = "A new tunic." }
+#
+# Keys at the top level are defaults for every job. Each job's actor is built in
+# its own process. Jobs that write into the same output root share its
+# Bootup.pack, ActorInfo, message packs and TitleBG.pack, so those are built
+# from all of the root's actors and written once.
+
+import argparse
+import json
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+from . import util
+from .actor import ActorOutput, BATActor, SaveTransaction
+
+
+JOB_KEYS = {"base", "name", "links", "tags", "texts", "output", "big_endian", "compression"}
+
+
+def load_jobs(path: Path) -> List[Dict[str, Any]]:
+    """Reads a job file, raises ValueError if it isn't valid"""
+    if path.suffix.lower() == ".toml":
+        if tomllib is None:
+            raise ValueError("Reading TOML job files needs Python 3.11 or tomli")
+        doc = tomllib.loads(path.read_text(encoding="utf-8"))
+    else:
+        doc = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(doc, dict) or not isinstance(doc.get("jobs"), list):
+        raise ValueError(f"{path} has no list of jobs")
+    defaults = {key: value for key, value in doc.items() if not key == "jobs"}
+    jobs: List[Dict[str, Any]] = []
+    endians: Dict[str, bool] = {}
+    compressions: Dict[str, Optional[str]] = {}
+    for i, job in enumerate(doc["jobs"]):
+        job = {**defaults, **job}
+        unknown = set(job) - JOB_KEYS
+        if unknown:
+            raise ValueError(f"Job {i} has unknown keys: {', '.join(sorted(unknown))}")
+        for key in ("base", "name", "output"):
+            if not key in job:
+                raise ValueError(f"Job {i} has no {key}")
+        if not "big_endian" in job:
+            # same as saving from the GUI, content is Wii U and romfs is Switch
+            root_name = Path(job["output"]).name
+            if not root_name in ("content", "romfs"):
+                raise ValueError(f"Job {i} needs big_endian, its output isn't content or romfs")
+            job["big_endian"] = root_name == "content"
+        root = str(Path(job["output"]).resolve())
+        if not endians.setdefault(root, job["big_endian"]) == job["big_endian"]:
+            raise ValueError(f"Job {i} writes into {root} with a different endianness")
+        # a root's shared files are saved once, with a single compression mode
+        compression = job.get("compression")
+        if not compression is None and not compression in util.YAZ0_MODES:
+            raise ValueError(f"Job {i} has unknown compression {compression}")
+        if not compressions.setdefault(root, compression) == compression:
+            raise ValueError(f"Job {i} writes into {root} with a different compression")
+        jobs.append(job)
+    return jobs
+
+
+def _find_base(base: str) -> Union[Path, str]:
+    if base.endswith(".sbactorpack") and Path(base).exists():
+        return Path(base)
+    return util.find_file(Path(f"Actor/Pack/{base}.sbactorpack"))
+
+
+def build_job(job: Dict[str, Any], workers: Optional[int] = None) -> ActorOutput:
+    actor = BATActor(_find_base(job["base"]))
+    if not job["name"] == actor.get_name():
+        actor.set_name(job["name"])
+    for link, linkref in job.get("links", {}).items():
+        if not actor.set_link(link, linkref):
+            raise ValueError(f"Can't set {link} to {linkref}")
+    if "tags" in job:
+        tags = job["tags"]
+        actor.set_tags(tags if isinstance(tags, str) else ", ".join(tags))
+    for lang, texts in job.get("texts", {}).items():
+        actor.set_texts(texts, lang)
+    return actor.get_output(job["big_endian"], job.get("compression"), workers)
+
+
+def _build_job(job: Dict[str, Any]) -> Tuple[Optional[ActorOutput], str]:
+    try:
+        return build_job(job, 1), ""
+    except Exception:
+        return None, traceback.format_exc()
+
+
+def _save_root(
+    jobs: List[Dict[str, Any]], outputs: List[ActorOutput], workers: Optional[int]
+) -> Optional[str]:
+    """Writes the built actors for one output root, returns the error if it fails"""
+    first = jobs[0]
+    try:
+        with SaveTransaction(
+            first["output"], first["big_endian"], first.get("compression"), workers
+        ) as transaction:
+            for output in outputs:
+                transaction.add_output(output)
+    except Exception:
+        return traceback.format_exc()
+    return None
+
+
+def run_jobs(jobs: List[Dict[str, Any]], workers: Optional[int] = None) -> List[Tuple[str, str]]:
+    """
+    Builds every job's actor, in up to workers processes, then writes them into
+    their output roots, each root's shared files once for all of its actors.
+    Uses the worker count from the settings if none is given. Returns the name
+    and error of every failed job.
+    """
+    workers = workers or util.BatSettings().get_save_workers()
+    if workers <= 1 or len(jobs) <= 1:
+        built = [_build_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            built = list(pool.map(_build_job, jobs))
+
+    failed: List[Tuple[str, str]] = []
+    roots: Dict[str, Tuple[List[Dict[str, Any]], List[ActorOutput]]] = {}
+    for job, (output, error) in zip(jobs, built):
+        if output is None:
+            failed.append((job["name"], error))
+            continue
+        root_jobs, outputs = roots.setdefault(str(Path(job["output"]).resolve()), ([], []))
+        root_jobs.append(job)
+        outputs.append(output)
+
+    groups = list(roots.values())
+    if workers <= 1 or len(groups) <= 1:
+        # a single root can still spread its compression over processes
+        errors = [_save_root(root_jobs, outputs, None) for root_jobs, outputs in groups]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(groups))) as pool:
+            errors = list(
+                pool.map(
+                    _save_root,
+                    [root_jobs for root_jobs, _ in groups],
+                    [outputs for _, outputs in groups],
+                    [1] * len(groups),
+                )
+            )
+    for (root_jobs, _), error in zip(groups, errors):
+        if error is not None:
+            failed.extend((job["name"], error) for job in root_jobs)
+    return failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Builds BotW actors from a job file")
+    parser.add_argument("jobs", help="JSON or TOML file listing the actors to build")
+    parser.add_argument(
+        "-w", "--workers", type=int, help="Processes to use, by default the save_workers setting"
+    )
+    args = parser.parse_args()
+
+    try:
+        jobs = load_jobs(Path(args.jobs))
+    except (OSError, ValueError) as err:
+        print(f"Couldn't read {args.jobs}: {err}", file=sys.stderr)
+        sys.exit(2)
+    failed = run_jobs(jobs, args.workers)
+    for name, error in failed:
+        print(f"{name} failed:\n{error}", file=sys.stderr)
+    print(f"Built {len(jobs) - len(failed)} of {len(jobs)} actors")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
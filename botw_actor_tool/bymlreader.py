@@ -0,0 +1,246 @@
+# Breath of the Wild Actor Tool, edits actor files fin LoZ:BotW
+# Copyright (C) 2020 GingerAvalanche (chodness@gmail.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# oead.byml.from_binary always builds the entire document. ActorInfo has thousands
+# of entries and we usually want exactly one of them (or just their names), so this
+# walks the binary node tables directly and only decodes the nodes that are asked for.
+
+import oead
+from pathlib import Path
+from struct import Struct
+from typing import Any, Iterator, Optional, Tuple, Union
+from zlib import crc32
+
+from . import util
+
+
+NODE_STRING = 0xA0
+NODE_BINARY = 0xA1
+NODE_ARRAY = 0xC0
+NODE_HASH = 0xC1
+NODE_STRING_TABLE = 0xC2
+NODE_BOOL = 0xD0
+NODE_INT = 0xD1
+NODE_FLOAT = 0xD2
+NODE_UINT = 0xD3
+NODE_INT64 = 0xD4
+NODE_UINT64 = 0xD5
+NODE_DOUBLE = 0xD6
+NODE_NULL = 0xFF
+
+
+class BymlReader:
+    """Random-access reader over a (decompressed) binary BYML document"""
+
+    _data: memoryview
+    _be: bool
+    _u32: Struct
+    _f32: Struct
+    _u64: Struct
+    _s64: Struct
+    _f64: Struct
+    _keys: Tuple[str, ...]
+    _strings_offset: int
+    _root_offset: int
+
+    def __init__(self, data: Union[bytes, memoryview]) -> None:
+        self._data = memoryview(data)
+        magic = bytes(self._data[0:2])
+        if magic == b"BY":
+            self._be = True
+        elif magic == b"YB":
+            self._be = False
+        else:
+            raise ValueError("Not a BYML document")
+        order = ">" if self._be else "<"
+        self._u32 = Struct(f"{order}I")
+        self._f32 = Struct(f"{order}f")
+        self._u64 = Struct(f"{order}Q")
+        self._s64 = Struct(f"{order}q")
+        self._f64 = Struct(f"{order}d")
+        keys_offset = self._u32.unpack_from(self._data, 4)[0]
+        self._strings_offset = self._u32.unpack_from(self._data, 8)[0]
+        self._root_offset = self._u32.unpack_from(self._data, 12)[0]
+        self._keys = tuple(self._read_string_table(keys_offset)) if keys_offset else ()
+
+    @classmethod
+    def from_file(cls, path: Path):
+        return cls(util.unyaz_if_needed(path.read_bytes()))
+
+    def _u24(self, offset: int) -> int:
+        b = self._data[offset : offset + 3]
+        if self._be:
+            return (b[0] << 16) | (b[1] << 8) | b[2]
+        return b[0] | (b[1] << 8) | (b[2] << 16)
+
+    def _read_string_table(self, offset: int) -> Iterator[str]:
+        count = self._u24(offset + 1)
+        for i in range(count):
+            yield self._read_table_string(offset, i)
+
+    def _read_table_string(self, table_offset: int, idx: int) -> str:
+        start = table_offset + self._u32.unpack_from(self._data, table_offset + 4 + 4 * idx)[0]
+        end = table_offset + self._u32.unpack_from(self._data, table_offset + 8 + 4 * idx)[0]
+        return bytes(self._data[start:end]).split(b"\x00", 1)[0].decode("utf-8")
+
+    def root(self) -> Tuple[int, int]:
+        """Returns the (node type, offset) of the document root"""
+        return (self._data[self._root_offset], self._root_offset)
+
+    def key_index(self, key: str) -> int:
+        """Returns the hash key table index of a key, or -1 if it isn't used anywhere"""
+        try:
+            return self._keys.index(key)
+        except ValueError:
+            return -1
+
+    def count(self, offset: int) -> int:
+        """Returns the number of children of the array or hash at the offset"""
+        return self._u24(offset + 1)
+
+    def array_item(self, offset: int, idx: int) -> Tuple[int, int]:
+        """Returns the (node type, raw value) of an array child without decoding it"""
+        count = self._u24(offset + 1)
+        values_offset = offset + 4 + ((count + 3) & ~3)
+        return (
+            self._data[offset + 4 + idx],
+            self._u32.unpack_from(self._data, values_offset + 4 * idx)[0],
+        )
+
+    def hash_item(self, offset: int, key: str) -> Optional[Tuple[int, int]]:
+        """Returns the (node type, raw value) of a hash child without decoding it"""
+        key_idx = self.key_index(key)
+        if key_idx == -1:
+            return None
+        return self._hash_item_by_index(offset, key_idx)
+
+    def _hash_item_by_index(self, offset: int, key_idx: int) -> Optional[Tuple[int, int]]:
+        # hash entries are sorted by key index, so this could bisect, but entries
+        # are small enough that a straight scan is just as quick in Python
+        for i in range(self._u24(offset + 1)):
+            entry = offset + 4 + 8 * i
+            if self._u24(entry) == key_idx:
+                return (self._data[entry + 3], self._u32.unpack_from(self._data, entry + 4)[0])
+        return None
+
+    def decode(self, node_type: int, value: int) -> Any:
+        """Decodes a single node (and its whole subtree) into oead types"""
+        if node_type == NODE_STRING:
+            return self._read_table_string(self._strings_offset, value)
+        elif node_type == NODE_HASH:
+            r = oead.byml.Hash()
+            for i in range(self._u24(value + 1)):
+                entry = value + 4 + 8 * i
+                key = self._keys[self._u24(entry)]
+                val = self._u32.unpack_from(self._data, entry + 4)[0]
+                r[key] = self.decode(self._data[entry + 3], val)
+            return r
+        elif node_type == NODE_ARRAY:
+            count = self._u24(value + 1)
+            values_offset = value + 4 + ((count + 3) & ~3)
+            return oead.byml.Array(
+                [
+                    self.decode(
+                        self._data[value + 4 + i],
+                        self._u32.unpack_from(self._data, values_offset + 4 * i)[0],
+                    )
+                    for i in range(count)
+                ]
+            )
+        elif node_type == NODE_BOOL:
+            return bool(value)
+        elif node_type == NODE_INT:
+            return oead.S32(value - 0x100000000 if value & 0x80000000 else value)
+        elif node_type == NODE_FLOAT:
+            return oead.F32(self._f32.unpack(self._u32.pack(value))[0])
+        elif node_type == NODE_UINT:
+            return oead.U32(value)
+        elif node_type == NODE_INT64:
+            return oead.S64(self._s64.unpack_from(self._data, value)[0])
+        elif node_type == NODE_UINT64:
+            return oead.U64(self._u64.unpack_from(self._data, value)[0])
+        elif node_type == NODE_DOUBLE:
+            return oead.F64(self._f64.unpack_from(self._data, value)[0])
+        elif node_type == NODE_BINARY:
+            size = self._u32.unpack_from(self._data, value)[0]
+            return oead.Bytes(bytes(self._data[value + 4 : value + 4 + size]))
+        elif node_type == NODE_NULL:
+            return None
+        raise ValueError(f"Unknown BYML node type {hex(node_type)}")
+
+
+class ActorInfoReader(BymlReader):
+    """Lazy access to the entries of ActorInfo.product.sbyml"""
+
+    _actors: int
+    _hashes: int
+    _name_key: int
+
+    def __init__(self, data: Union[bytes, memoryview]) -> None:
+        super(ActorInfoReader, self).__init__(data)
+        node_type, root = self.root()
+        if not node_type == NODE_HASH:
+            raise ValueError("ActorInfo root is not a hash")
+        actors = self.hash_item(root, "Actors")
+        hashes = self.hash_item(root, "Hashes")
+        if not actors or not hashes:
+            raise ValueError("ActorInfo is missing its Actors or Hashes")
+        self._actors = actors[1]
+        self._hashes = hashes[1]
+        self._name_key = self.key_index("name")
+
+    def __len__(self) -> int:
+        return self.count(self._actors)
+
+    def find_index(self, name: str) -> int:
+        """Binary searches Hashes for the actor, returns -1 if it isn't there"""
+        hash = crc32(name.encode("utf-8"))
+        lo = 0
+        hi = self.count(self._hashes)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_hash = self.array_item(self._hashes, mid)[1]
+            if mid_hash < hash:
+                lo = mid + 1
+            elif mid_hash > hash:
+                hi = mid
+            else:
+                return mid
+        return -1
+
+    def get_info(self, name: str) -> Optional[oead.byml.Hash]:
+        idx = self.find_index(name)
+        if idx == -1:
+            return None
+        info = self.decode(*self.array_item(self._actors, idx))
+        if not info["name"] == name:
+            return None
+        return info
+
+    def iter_names(self) -> Iterator[str]:
+        """Streams the actor names without decoding anything else"""
+        if self._name_key == -1:
+            return
+        for i in range(len(self)):
+            node_type, offset = self.array_item(self._actors, i)
+            name = self._hash_item_by_index(offset, self._name_key)
+            if name:
+                yield self.decode(*name)
+
+    def iter_infos(self) -> Iterator[oead.byml.Hash]:
+        """Streams the actor info entries, one decoded entry at a time"""
+        for i in range(len(self)):
+            yield self.decode(*self.array_item(self._actors, i))
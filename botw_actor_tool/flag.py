@@ -27,15 +27,100 @@ from oead import (
     Vector4f,
 )
 from oead.byml import Hash, Array
-from typing import List, Tuple
+from typing import Any, Dict, List, Pattern, Tuple
 from zlib import crc32
 import re
 
 from . import overrides
 
 
+class OverrideRules:
+    """
+    One group of overrides.json, compiled once. The patterns of each field are
+    also joined into a single alternation, so a name that none of them match
+    (most names) costs one search per field. Results are memoized per name.
+    """
+
+    _fields: List[Tuple[str, Pattern, List[Tuple[Pattern, Any]]]]
+    _cache: Dict[str, Tuple[Tuple[str, Any], ...]]
+
+    def __init__(self, group: str) -> None:
+        self._fields = []
+        self._cache = {}
+        type_prefix = group[: -len("OVERRIDES")]
+        for field, rules in overrides[group].items():
+            if not rules:
+                continue
+            # OVERRIDE_BOOL_INIT_VALUE -> init_value, OVERRIDE_IS_SAVE -> is_save
+            attr = field[len("OVERRIDE_") :]
+            if attr.startswith(type_prefix):
+                attr = attr[len(type_prefix) :]
+            self._fields.append(
+                (
+                    attr.lower(),
+                    re.compile("|".join(f"(?:{regex})" for regex in rules)),
+                    [(re.compile(regex), value) for regex, value in rules.items()],
+                )
+            )
+
+    def get(self, data_name: str) -> Tuple[Tuple[str, Any], ...]:
+        """Returns the (attribute, value) pairs that apply to a flag name"""
+        if data_name in self._cache:
+            return self._cache[data_name]
+        r = []
+        for attr, any_rule, rules in self._fields:
+            if any_rule.search(data_name):
+                # later rules win, like they always have
+                for rule, value in reversed(rules):
+                    if rule.search(data_name):
+                        r.append((attr, value))
+                        break
+        self._cache[data_name] = tuple(r)
+        return self._cache[data_name]
+
+
+OVERRIDE_RULES = {group: OverrideRules(group) for group in overrides}
+_STATE_SLOTS: Dict[type, Tuple[str, ...]] = {}
+
+
+def _state_slots(flag_class: type) -> Tuple[str, ...]:
+    """The slots of a flag class that hold its state, everything but _owner"""
+    if not flag_class in _STATE_SLOTS:
+        _STATE_SLOTS[flag_class] = tuple(
+            slot
+            for cls in flag_class.__mro__
+            for slot in getattr(cls, "__slots__", ())
+            if not slot == "_owner"
+        )
+    return _STATE_SLOTS[flag_class]
+
+
 class BFUFlag:
+    __slots__ = (
+        "_data_name",
+        "_hash_value",
+        "delete_rev",
+        "is_event_associated",
+        "is_one_trigger",
+        "is_program_readable",
+        "is_program_writable",
+        "is_save",
+        "reset_type",
+        "_owner",
+    )
+    _data_name: str
+    _hash_value: int
+    delete_rev: int
+    is_event_associated: bool
+    is_one_trigger: bool
+    is_program_readable: bool
+    is_program_writable: bool
+    is_save: bool
+    reset_type: int
+    _owner: Any
+
     def __init__(self, flag: Hash = None) -> None:
+        self._owner = None
         self.data_name = ""
         self.delete_rev = -1
         self.is_event_associated = False
@@ -56,6 +141,28 @@ class BFUFlag:
             self.is_save = flag["IsSave"]
             self.reset_type = flag["ResetType"].v
 
+    def set_owner(self, owner) -> None:
+        """
+        Sets the object (usually a FlagTable) whose flag_renamed(flag, old_hash)
+        is called when this flag's name, and so its hash, changes, or None
+        """
+        self._owner = owner
+
+    def copy(self) -> "BFUFlag":
+        """Returns an unowned copy of the flag"""
+        flag = type(self).__new__(type(self))
+        for slot in _state_slots(type(self)):
+            value = getattr(self, slot)
+            setattr(flag, slot, value[:] if isinstance(value, list) else value)
+        flag._owner = None
+        return flag
+
+    def same_state(self, other: "BFUFlag") -> bool:
+        """Returns True if other is the same type of flag with every attribute the same"""
+        return type(self) is type(other) and all(
+            getattr(self, slot) == getattr(other, slot) for slot in _state_slots(type(self))
+        )
+
     def __eq__(self, other):
         if self is other:
             return True
@@ -123,73 +230,26 @@ class BFUFlag:
 
     @data_name.setter
     def data_name(self, name: str) -> None:
+        owner = self._owner
+        old_hash = self._hash_value if owner is not None else 0
         self._data_name = name
         self._hash_value = c_int32(crc32(name.encode("utf-8"))).value
-
-    @property
-    def delete_rev(self) -> int:
-        return self._delete_rev
-
-    @delete_rev.setter
-    def delete_rev(self, drev: int) -> None:
-        self._delete_rev = drev
+        if owner is not None and not self._hash_value == old_hash:
+            # the owner keeps its flags by hash, so it has to move this one
+            owner.flag_renamed(self, old_hash)
 
     @property
     def hash_value(self) -> int:
         return self._hash_value
 
-    @property
-    def is_event_associated(self) -> bool:
-        return self._is_event_associated
-
-    @is_event_associated.setter
-    def is_event_associated(self, event_assoc: bool) -> None:
-        self._is_event_associated = event_assoc
-
-    @property
-    def is_one_trigger(self) -> bool:
-        return self._is_one_trigger
-
-    @is_one_trigger.setter
-    def is_one_trigger(self, is_one: bool) -> None:
-        self._is_one_trigger = is_one
-
-    @property
-    def is_program_readable(self) -> bool:
-        return self._is_program_readable
-
-    @is_program_readable.setter
-    def is_program_readable(self, is_read: bool) -> None:
-        self._is_program_readable = is_read
-
-    @property
-    def is_program_writable(self) -> bool:
-        return self._is_program_writable
-
-    @is_program_writable.setter
-    def is_program_writable(self, is_write: bool) -> None:
-        self._is_program_writable = is_write
-
-    @property
-    def is_save(self) -> bool:
-        return self._is_save
-
-    @is_save.setter
-    def is_save(self, save: bool) -> None:
-        self._is_save = save
-
-    @property
-    def reset_type(self) -> int:
-        return self._reset_type
-
-    @reset_type.setter
-    def reset_type(self, reset_type: int) -> None:
-        self._reset_type = reset_type
-
     @property
     def is_revival(self) -> bool:
         return False
 
+    def _apply_overrides(self, group: str) -> None:
+        for attr, value in OVERRIDE_RULES[group].get(self.data_name):
+            setattr(self, attr, value)
+
     def use_name_to_override_params(self) -> None:
         """
         Sets flag parameters to those mandated by the overrides.
@@ -198,28 +258,17 @@ class BFUFlag:
         that certain values that should always be the same for
         certain flag types are upheld.
         """
-        OVERRIDES = overrides["STANDARD_OVERRIDES"]
-        for regex, value in OVERRIDES["OVERRIDE_IS_EVENT_ASSOCIATED"].items():
-            if re.search(regex, self.data_name):
-                self.is_event_associated = value
-        for regex, value in OVERRIDES["OVERRIDE_IS_ONE_TRIGGER"].items():
-            if re.search(regex, self.data_name):
-                self.is_one_trigger = value
-        for regex, value in OVERRIDES["OVERRIDE_IS_PROGRAM_READABLE"].items():
-            if re.search(regex, self.data_name):
-                self.is_program_readable = value
-        for regex, value in OVERRIDES["OVERRIDE_IS_PROGRAM_WRITABLE"].items():
-            if re.search(regex, self.data_name):
-                self.is_program_writable = value
-        for regex, value in OVERRIDES["OVERRIDE_IS_SAVE"].items():
-            if re.search(regex, self.data_name):
-                self.is_save = value
-        for regex, value in OVERRIDES["OVERRIDE_RESET_TYPE"].items():
-            if re.search(regex, self.data_name):
-                self.reset_type = value
+        self._apply_overrides("STANDARD_OVERRIDES")
 
 
 class BoolFlag(BFUFlag):
+    __slots__ = ("category", "init_value", "max_value", "min_value", "is_revival")
+    category: int
+    init_value: int
+    max_value: bool
+    min_value: bool
+    is_revival: bool
+
     def __init__(self, flag: Hash = None, **kwargs) -> None:
         super(BoolFlag, self).__init__(flag=flag)
         self.category = -1
@@ -271,46 +320,6 @@ class BoolFlag(BFUFlag):
         r["MinValue"] = self.min_value
         return r
 
-    @property
-    def category(self) -> int:
-        return self._category
-
-    @category.setter
-    def category(self, value: int) -> None:
-        self._category = value
-
-    @property
-    def init_value(self) -> int:
-        return self._init_value
-
-    @init_value.setter
-    def init_value(self, value: bool) -> None:
-        self._init_value = value
-
-    @property
-    def max_value(self) -> bool:
-        return self._max_value
-
-    @max_value.setter
-    def max_value(self, value: bool) -> None:
-        self._max_value = value
-
-    @property
-    def min_value(self) -> bool:
-        return self._min_value
-
-    @min_value.setter
-    def min_value(self, value: bool) -> None:
-        self._min_value = value
-
-    @property
-    def is_revival(self) -> bool:
-        return self._revival
-
-    @is_revival.setter
-    def is_revival(self, revival: bool) -> None:
-        self._revival = revival
-
     def use_name_to_override_params(self) -> None:
         """
         Sets flag parameters to those mandated by the overrides.
@@ -320,16 +329,15 @@ class BoolFlag(BFUFlag):
         certain flag types are upheld.
         """
         super(BoolFlag, self).use_name_to_override_params()
-        OVERRIDES = overrides["BOOL_OVERRIDES"]
-        for regex, value in OVERRIDES["OVERRIDE_BOOL_CATEGORY"].items():
-            if re.search(regex, self.data_name):
-                self.category = value
-        for regex, value in OVERRIDES["OVERRIDE_BOOL_INIT_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.init_value = value
+        self._apply_overrides("BOOL_OVERRIDES")
 
 
 class BoolArrayFlag(BFUFlag):
+    __slots__ = ("init_value", "max_value", "min_value")
+    init_value: List[int]
+    max_value: bool
+    min_value: bool
+
     def __init__(self, flag: Hash = None, **kwargs) -> None:
         super(BoolArrayFlag, self).__init__(flag=flag)
         self.init_value = [0]
@@ -381,30 +389,6 @@ class BoolArrayFlag(BFUFlag):
         r["MinValue"] = self.min_value
         return r
 
-    @property
-    def init_value(self) -> List[int]:
-        return self._init_value
-
-    @init_value.setter
-    def init_value(self, value: List[int]) -> None:
-        self._init_value = value
-
-    @property
-    def max_value(self) -> bool:
-        return self._max_value
-
-    @max_value.setter
-    def max_value(self, value: bool) -> None:
-        self._max_value = value
-
-    @property
-    def min_value(self) -> bool:
-        return self._min_value
-
-    @min_value.setter
-    def min_value(self, value: bool) -> None:
-        self._min_value = value
-
     def use_name_to_override_params(self) -> None:
         """
         Sets flag parameters to those mandated by the overrides.
@@ -414,19 +398,16 @@ class BoolArrayFlag(BFUFlag):
         certain flag types are upheld.
         """
         super(BoolArrayFlag, self).use_name_to_override_params()
-        OVERRIDES = overrides["BOOL_ARRAY_OVERRIDES"]
-        for regex, value in OVERRIDES["OVERRIDE_BOOL_ARRAY_INIT_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.init_value = value
-        for regex, value in OVERRIDES["OVERRIDE_BOOL_ARRAY_MAX_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.max_value = value
-        for regex, value in OVERRIDES["OVERRIDE_BOOL_ARRAY_MIN_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.min_value = value
+        self._apply_overrides("BOOL_ARRAY_OVERRIDES")
 
 
 class S32Flag(BFUFlag):
+    __slots__ = ("init_value", "max_value", "min_value", "is_revival")
+    init_value: int
+    max_value: int
+    min_value: int
+    is_revival: bool
+
     def __init__(self, flag: Hash = None, **kwargs) -> None:
         super(S32Flag, self).__init__(flag=flag)
         self.init_value = 0
@@ -436,9 +417,9 @@ class S32Flag(BFUFlag):
         if flag:
             if not S32Flag.validate_Hash(flag):
                 raise AttributeError(f"{flag['DataName']} is malformed.")
-            self._init_value = flag["InitValue"].v
-            self._max_value = flag["MaxValue"].v
-            self._min_value = flag["MinValue"].v
+            self.init_value = flag["InitValue"].v
+            self.max_value = flag["MaxValue"].v
+            self.min_value = flag["MinValue"].v
 
     def __eq__(self, other):
         if not type(other) == S32Flag:
@@ -466,43 +447,11 @@ class S32Flag(BFUFlag):
 
     def to_Hash(self) -> Hash:
         r = super(S32Flag, self).to_Hash()
-        r["InitValue"] = S32(self._init_value)
-        r["MaxValue"] = S32(self._max_value)
-        r["MinValue"] = S32(self._min_value)
+        r["InitValue"] = S32(self.init_value)
+        r["MaxValue"] = S32(self.max_value)
+        r["MinValue"] = S32(self.min_value)
         return r
 
-    @property
-    def init_value(self) -> int:
-        return self._init_value
-
-    @init_value.setter
-    def init_value(self, value: int) -> None:
-        self._init_value = value
-
-    @property
-    def max_value(self) -> int:
-        return self._max_value
-
-    @max_value.setter
-    def max_value(self, value: int) -> None:
-        self._max_value = value
-
-    @property
-    def min_value(self) -> int:
-        return self._min_value
-
-    @min_value.setter
-    def min_value(self, value: int) -> None:
-        self._min_value = value
-
-    @property
-    def is_revival(self) -> bool:
-        return self._revival
-
-    @is_revival.setter
-    def is_revival(self, revival: bool) -> None:
-        self._revival = revival
-
     def use_name_to_override_params(self) -> None:
         """
         Sets flag parameters to those mandated by the overrides.
@@ -512,19 +461,15 @@ class S32Flag(BFUFlag):
         certain flag types are upheld.
         """
         super(S32Flag, self).use_name_to_override_params()
-        OVERRIDES = overrides["S32_OVERRIDES"]
-        for regex, value in OVERRIDES["OVERRIDE_S32_INIT_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.init_value = value
-        for regex, value in OVERRIDES["OVERRIDE_S32_MAX_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.max_value = value
-        for regex, value in OVERRIDES["OVERRIDE_S32_MIN_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.min_value = value
+        self._apply_overrides("S32_OVERRIDES")
 
 
 class S32ArrayFlag(BFUFlag):
+    __slots__ = ("init_value", "max_value", "min_value")
+    init_value: List[int]
+    max_value: int
+    min_value: int
+
     def __init__(self, flag: Hash = None, **kwargs) -> None:
         super(S32ArrayFlag, self).__init__(flag=flag)
         self.init_value = [0]
@@ -576,30 +521,6 @@ class S32ArrayFlag(BFUFlag):
         r["MinValue"] = S32(self.min_value)
         return r
 
-    @property
-    def init_value(self) -> List[int]:
-        return self._init_value
-
-    @init_value.setter
-    def init_value(self, value: List[int]) -> None:
-        self._init_value = value
-
-    @property
-    def max_value(self) -> int:
-        return self._max_value
-
-    @max_value.setter
-    def max_value(self, value: int) -> None:
-        self._max_value = value
-
-    @property
-    def min_value(self) -> int:
-        return self._min_value
-
-    @min_value.setter
-    def min_value(self, value: int) -> None:
-        self._min_value = value
-
     def use_name_to_override_params(self) -> None:
         """
         Sets flag parameters to those mandated by the overrides.
@@ -609,19 +530,15 @@ class S32ArrayFlag(BFUFlag):
         certain flag types are upheld.
         """
         super(S32ArrayFlag, self).use_name_to_override_params()
-        OVERRIDES = overrides["S32_ARRAY_OVERRIDES"]
-        for regex, value in OVERRIDES["OVERRIDE_S32_ARRAY_INIT_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.init_value = value
-        for regex, value in OVERRIDES["OVERRIDE_S32_ARRAY_MAX_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.max_value = value
-        for regex, value in OVERRIDES["OVERRIDE_S32_ARRAY_MIN_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.min_value = value
+        self._apply_overrides("S32_ARRAY_OVERRIDES")
 
 
 class F32Flag(BFUFlag):
+    __slots__ = ("init_value", "max_value", "min_value")
+    init_value: float
+    max_value: float
+    min_value: float
+
     def __init__(self, flag: Hash = None, **kwargs) -> None:
         super(F32Flag, self).__init__(flag=flag)
         self.init_value = 0.0
@@ -665,30 +582,6 @@ class F32Flag(BFUFlag):
         r["MinValue"] = F32(self.min_value)
         return r
 
-    @property
-    def init_value(self) -> float:
-        return self._init_value
-
-    @init_value.setter
-    def init_value(self, value: float) -> None:
-        self._init_value = value
-
-    @property
-    def max_value(self) -> float:
-        return self._max_value
-
-    @max_value.setter
-    def max_value(self, value: float) -> None:
-        self._max_value = value
-
-    @property
-    def min_value(self) -> float:
-        return self._min_value
-
-    @min_value.setter
-    def min_value(self, value: float) -> None:
-        self._min_value = value
-
     def use_name_to_override_params(self) -> None:
         """
         Sets flag parameters to those mandated by the overrides.
@@ -698,19 +591,15 @@ class F32Flag(BFUFlag):
         certain flag types are upheld.
         """
         super(F32Flag, self).use_name_to_override_params()
-        OVERRIDES = overrides["F32_OVERRIDES"]
-        for regex, value in OVERRIDES["OVERRIDE_F32_INIT_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.init_value = value
-        for regex, value in OVERRIDES["OVERRIDE_F32_MAX_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.max_value = value
-        for regex, value in OVERRIDES["OVERRIDE_F32_MIN_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.min_value = value
+        self._apply_overrides("F32_OVERRIDES")
 
 
 class F32ArrayFlag(BFUFlag):
+    __slots__ = ("init_value", "max_value", "min_value")
+    init_value: List[float]
+    max_value: float
+    min_value: float
+
     def __init__(self, flag: Hash = None, **kwargs) -> None:
         super(F32ArrayFlag, self).__init__(flag=flag)
         self.init_value = [0.0]
@@ -762,30 +651,6 @@ class F32ArrayFlag(BFUFlag):
         r["MinValue"] = F32(self.min_value)
         return r
 
-    @property
-    def init_value(self) -> List[float]:
-        return self._init_value
-
-    @init_value.setter
-    def init_value(self, value: List[float]) -> None:
-        self._init_value = value
-
-    @property
-    def max_value(self) -> float:
-        return self._max_value
-
-    @max_value.setter
-    def max_value(self, value: float) -> None:
-        self._max_value = value
-
-    @property
-    def min_value(self) -> float:
-        return self._min_value
-
-    @min_value.setter
-    def min_value(self, value: float) -> None:
-        self._min_value = value
-
     def use_name_to_override_params(self) -> None:
         """
         Sets flag parameters to those mandated by the overrides.
@@ -795,19 +660,15 @@ class F32ArrayFlag(BFUFlag):
         certain flag types are upheld.
         """
         super(F32ArrayFlag, self).use_name_to_override_params()
-        OVERRIDES = overrides["F32_ARRAY_OVERRIDES"]
-        for regex, value in OVERRIDES["OVERRIDE_F32_ARRAY_INIT_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.init_value = value
-        for regex, value in OVERRIDES["OVERRIDE_F32_ARRAY_MAX_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.max_value = value
-        for regex, value in OVERRIDES["OVERRIDE_F32_ARRAY_MIN_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.min_value = value
+        self._apply_overrides("F32_ARRAY_OVERRIDES")
 
 
 class StringFlag(BFUFlag):
+    __slots__ = ("init_value", "max_value", "min_value")
+    init_value: str
+    max_value: str
+    min_value: str
+
     def __init__(self, flag: Hash = None, **kwargs) -> None:
         super(StringFlag, self).__init__(flag=flag)
         self.init_value = ""
@@ -848,30 +709,6 @@ class StringFlag(BFUFlag):
         r = super(StringFlag, self).to_Hash()
         return r
 
-    @property
-    def init_value(self) -> str:
-        return self._init_value
-
-    @init_value.setter
-    def init_value(self, value: str) -> None:
-        self._init_value = value
-
-    @property
-    def max_value(self) -> str:
-        return self._max_value
-
-    @max_value.setter
-    def max_value(self, value: str) -> None:
-        self._max_value = value
-
-    @property
-    def min_value(self) -> str:
-        return self._min_value
-
-    @min_value.setter
-    def min_value(self, value: str) -> None:
-        self._min_value = value
-
     def use_name_to_override_params(self) -> None:
         """
         Sets flag parameters to those mandated by the overrides.
@@ -881,19 +718,12 @@ class StringFlag(BFUFlag):
         certain flag types are upheld.
         """
         super(StringFlag, self).use_name_to_override_params()
-        OVERRIDES = overrides["STRING_OVERRIDES"]
-        for regex, value in OVERRIDES["OVERRIDE_STRING_INIT_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.init_value = value
-        for regex, value in OVERRIDES["OVERRIDE_STRING_MAX_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.max_value = value
-        for regex, value in OVERRIDES["OVERRIDE_STRING_MIN_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.min_value = value
+        self._apply_overrides("STRING_OVERRIDES")
 
 
 class String32Flag(StringFlag):
+    __slots__ = ()
+
     def __init__(self, flag: Hash = None, **kwargs) -> None:
         super(String32Flag, self).__init__(flag=flag)
 
@@ -909,6 +739,8 @@ class String32Flag(StringFlag):
 
 
 class String64Flag(StringFlag):
+    __slots__ = ()
+
     def __init__(self, flag: Hash = None, **kwargs) -> None:
         super(String64Flag, self).__init__(flag=flag)
 
@@ -924,6 +756,8 @@ class String64Flag(StringFlag):
 
 
 class String256Flag(StringFlag):
+    __slots__ = ()
+
     def __init__(self, flag: Hash = None, **kwargs) -> None:
         super(String256Flag, self).__init__(flag=flag)
 
@@ -939,6 +773,11 @@ class String256Flag(StringFlag):
 
 
 class StringArrayFlag(BFUFlag):
+    __slots__ = ("init_value", "max_value", "min_value")
+    init_value: List[str]
+    max_value: str
+    min_value: str
+
     def __init__(self, flag: Hash = None, **kwargs) -> None:
         super(StringArrayFlag, self).__init__(flag=flag)
         self.init_value = [""]
@@ -983,30 +822,6 @@ class StringArrayFlag(BFUFlag):
         r = super(StringArrayFlag, self).to_Hash()
         return r
 
-    @property
-    def init_value(self) -> List[str]:
-        return self._init_value
-
-    @init_value.setter
-    def init_value(self, value: List[str]) -> None:
-        self._init_value = value
-
-    @property
-    def max_value(self) -> str:
-        return self._max_value
-
-    @max_value.setter
-    def max_value(self, value: str) -> None:
-        self._max_value = value
-
-    @property
-    def min_value(self) -> str:
-        return self._min_value
-
-    @min_value.setter
-    def min_value(self, value: str) -> None:
-        self._min_value = value
-
     def use_name_to_override_params(self) -> None:
         """
         Sets flag parameters to those mandated by the overrides.
@@ -1016,19 +831,12 @@ class StringArrayFlag(BFUFlag):
         certain flag types are upheld.
         """
         super(StringArrayFlag, self).use_name_to_override_params()
-        OVERRIDES = overrides["STRING_ARRAY_OVERRIDES"]
-        for regex, value in OVERRIDES["OVERRIDE_STRING_ARRAY_INIT_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.init_value = value
-        for regex, value in OVERRIDES["OVERRIDE_STRING_ARRAY_MAX_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.max_value = value
-        for regex, value in OVERRIDES["OVERRIDE_STRING_ARRAY_MIN_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.min_value = value
+        self._apply_overrides("STRING_ARRAY_OVERRIDES")
 
 
 class String64ArrayFlag(StringArrayFlag):
+    __slots__ = ()
+
     def __init__(self, flag: Hash = None, **kwargs) -> None:
         super(String64ArrayFlag, self).__init__(flag=flag)
 
@@ -1048,6 +856,8 @@ class String64ArrayFlag(StringArrayFlag):
 
 
 class String256ArrayFlag(StringArrayFlag):
+    __slots__ = ()
+
     def __init__(self, flag: Hash = None, **kwargs) -> None:
         super(String256ArrayFlag, self).__init__(flag=flag)
 
@@ -1067,6 +877,11 @@ class String256ArrayFlag(StringArrayFlag):
 
 
 class Vec2Flag(BFUFlag):
+    __slots__ = ("init_value", "max_value", "min_value")
+    init_value: Tuple[float, float]
+    max_value: Tuple[float, float]
+    min_value: Tuple[float, float]
+
     def __init__(self, flag: Hash = None, **kwargs) -> None:
         super(Vec2Flag, self).__init__(flag=flag)
         self.init_value = (0.0, 0.0)
@@ -1128,30 +943,6 @@ class Vec2Flag(BFUFlag):
         r["MinValue"] = array
         return r
 
-    @property
-    def init_value(self) -> Tuple[float, float]:
-        return self._init_value
-
-    @init_value.setter
-    def init_value(self, value: Tuple[float, float]) -> None:
-        self._init_value = value
-
-    @property
-    def max_value(self) -> Tuple[float, float]:
-        return self._max_value
-
-    @max_value.setter
-    def max_value(self, value: Tuple[float, float]) -> None:
-        self._max_value = value
-
-    @property
-    def min_value(self) -> Tuple[float, float]:
-        return self._min_value
-
-    @min_value.setter
-    def min_value(self, value: Tuple[float, float]) -> None:
-        self._min_value = value
-
     def use_name_to_override_params(self) -> None:
         """
         Sets flag parameters to those mandated by the overrides.
@@ -1161,19 +952,15 @@ class Vec2Flag(BFUFlag):
         certain flag types are upheld.
         """
         super(Vec2Flag, self).use_name_to_override_params()
-        OVERRIDES = overrides["VEC2_OVERRIDES"]
-        for regex, value in OVERRIDES["OVERRIDE_VEC2_INIT_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.init_value = value
-        for regex, value in OVERRIDES["OVERRIDE_VEC2_MAX_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.max_value = value
-        for regex, value in OVERRIDES["OVERRIDE_VEC2_MIN_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.min_value = value
+        self._apply_overrides("VEC2_OVERRIDES")
 
 
 class Vec2ArrayFlag(BFUFlag):
+    __slots__ = ("init_value", "max_value", "min_value")
+    init_value: List[Tuple[float, float]]
+    max_value: Tuple[float, float]
+    min_value: Tuple[float, float]
+
     def __init__(self, flag: Hash = None, **kwargs) -> None:
         super(Vec2ArrayFlag, self).__init__(flag=flag)
         self.init_value = [(0.0, 0.0)]
@@ -1247,30 +1034,6 @@ class Vec2ArrayFlag(BFUFlag):
         r["MinValue"] = vec_array
         return r
 
-    @property
-    def init_value(self) -> List[Tuple[float, float]]:
-        return self._init_value
-
-    @init_value.setter
-    def init_value(self, value: List[Tuple[float, float]]) -> None:
-        self._init_value = value
-
-    @property
-    def max_value(self) -> Tuple[float, float]:
-        return self._max_value
-
-    @max_value.setter
-    def max_value(self, value: Tuple[float, float]) -> None:
-        self._max_value = value
-
-    @property
-    def min_value(self) -> Tuple[float, float]:
-        return self._min_value
-
-    @min_value.setter
-    def min_value(self, value: Tuple[float, float]) -> None:
-        self._min_value = value
-
     def use_name_to_override_params(self) -> None:
         """
         Sets flag parameters to those mandated by the overrides.
@@ -1280,19 +1043,15 @@ class Vec2ArrayFlag(BFUFlag):
         certain flag types are upheld.
         """
         super(Vec2ArrayFlag, self).use_name_to_override_params()
-        OVERRIDES = overrides["VEC2_ARRAY_OVERRIDES"]
-        for regex, value in OVERRIDES["OVERRIDE_VEC2_ARRAY_INIT_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.init_value = value
-        for regex, value in OVERRIDES["OVERRIDE_VEC2_ARRAY_MAX_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.max_value = value
-        for regex, value in OVERRIDES["OVERRIDE_VEC2_ARRAY_MIN_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.min_value = value
+        self._apply_overrides("VEC2_ARRAY_OVERRIDES")
 
 
 class Vec3Flag(BFUFlag):
+    __slots__ = ("init_value", "max_value", "min_value")
+    init_value: Tuple[float, float, float]
+    max_value: Tuple[float, float, float]
+    min_value: Tuple[float, float, float]
+
     def __init__(self, flag: Hash = None, **kwargs) -> None:
         super(Vec3Flag, self).__init__(flag=flag)
         self.init_value = (0.0, 0.0, 0.0)
@@ -1372,30 +1131,6 @@ class Vec3Flag(BFUFlag):
         r["MinValue"] = vec_array
         return r
 
-    @property
-    def init_value(self) -> Tuple[float, float, float]:
-        return self._init_value
-
-    @init_value.setter
-    def init_value(self, value: Tuple[float, float, float]) -> None:
-        self._init_value = value
-
-    @property
-    def max_value(self) -> Tuple[float, float, float]:
-        return self._max_value
-
-    @max_value.setter
-    def max_value(self, value: Tuple[float, float, float]) -> None:
-        self._max_value = value
-
-    @property
-    def min_value(self) -> Tuple[float, float, float]:
-        return self._min_value
-
-    @min_value.setter
-    def min_value(self, value: Tuple[float, float, float]) -> None:
-        self._min_value = value
-
     def use_name_to_override_params(self) -> None:
         """
         Sets flag parameters to those mandated by the overrides.
@@ -1405,19 +1140,15 @@ class Vec3Flag(BFUFlag):
         certain flag types are upheld.
         """
         super(Vec3Flag, self).use_name_to_override_params()
-        OVERRIDES = overrides["VEC3_OVERRIDES"]
-        for regex, value in OVERRIDES["OVERRIDE_VEC3_INIT_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.init_value = value
-        for regex, value in OVERRIDES["OVERRIDE_VEC3_MAX_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.max_value = value
-        for regex, value in OVERRIDES["OVERRIDE_VEC3_MIN_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.min_value = value
+        self._apply_overrides("VEC3_OVERRIDES")
 
 
 class Vec3ArrayFlag(BFUFlag):
+    __slots__ = ("init_value", "max_value", "min_value")
+    init_value: List[Tuple[float, float, float]]
+    max_value: Tuple[float, float, float]
+    min_value: Tuple[float, float, float]
+
     def __init__(self, flag: Hash = None, **kwargs) -> None:
         super(Vec3ArrayFlag, self).__init__(flag=flag)
         self.init_value = [(0.0, 0.0, 0.0)]
@@ -1505,30 +1236,6 @@ class Vec3ArrayFlag(BFUFlag):
         r["MinValue"] = vec_array
         return r
 
-    @property
-    def init_value(self) -> List[Tuple[float, float, float]]:
-        return self._init_value
-
-    @init_value.setter
-    def init_value(self, value: List[Tuple[float, float, float]]) -> None:
-        self._init_value = value
-
-    @property
-    def max_value(self) -> Tuple[float, float, float]:
-        return self._max_value
-
-    @max_value.setter
-    def max_value(self, value: Tuple[float, float, float]) -> None:
-        self._max_value = value
-
-    @property
-    def min_value(self) -> Tuple[float, float, float]:
-        return self._min_value
-
-    @min_value.setter
-    def min_value(self, value: Tuple[float, float, float]) -> None:
-        self._min_value = value
-
     def use_name_to_override_params(self) -> None:
         """
         Sets flag parameters to those mandated by the overrides.
@@ -1538,19 +1245,15 @@ class Vec3ArrayFlag(BFUFlag):
         certain flag types are upheld.
         """
         super(Vec3ArrayFlag, self).use_name_to_override_params()
-        OVERRIDES = overrides["VEC3_ARRAY_OVERRIDES"]
-        for regex, value in OVERRIDES["OVERRIDE_VEC3_ARRAY_INIT_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.init_value = value
-        for regex, value in OVERRIDES["OVERRIDE_VEC3_ARRAY_MAX_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.max_value = value
-        for regex, value in OVERRIDES["OVERRIDE_VEC3_ARRAY_MIN_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.min_value = value
+        self._apply_overrides("VEC3_ARRAY_OVERRIDES")
 
 
 class Vec4Flag(BFUFlag):
+    __slots__ = ("init_value", "max_value", "min_value")
+    init_value: Tuple[float, float, float, float]
+    max_value: Tuple[float, float, float, float]
+    min_value: Tuple[float, float, float, float]
+
     def __init__(self, flag: Hash = None, **kwargs) -> None:
         super(Vec4Flag, self).__init__(flag=flag)
         self.init_value = (0.0, 0.0, 0.0, 0.0)
@@ -1639,30 +1342,6 @@ class Vec4Flag(BFUFlag):
         r["MinValue"] = array
         return r
 
-    @property
-    def init_value(self) -> Tuple[float, float, float, float]:
-        return self._init_value
-
-    @init_value.setter
-    def init_value(self, value: Tuple[float, float, float, float]) -> None:
-        self._init_value = value
-
-    @property
-    def max_value(self) -> Tuple[float, float, float, float]:
-        return self._max_value
-
-    @max_value.setter
-    def max_value(self, value: Tuple[float, float, float, float]) -> None:
-        self._max_value = value
-
-    @property
-    def min_value(self) -> Tuple[float, float, float, float]:
-        return self._min_value
-
-    @min_value.setter
-    def min_value(self, value: Tuple[float, float, float, float]) -> None:
-        self._min_value = value
-
     def use_name_to_override_params(self) -> None:
         """
         Sets flag parameters to those mandated by the overrides.
@@ -1672,13 +1351,4 @@ class Vec4Flag(BFUFlag):
         certain flag types are upheld.
         """
         super(Vec4Flag, self).use_name_to_override_params()
-        OVERRIDES = overrides["VEC4_OVERRIDES"]
-        for regex, value in OVERRIDES["OVERRIDE_VEC4_INIT_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.init_value = value
-        for regex, value in OVERRIDES["OVERRIDE_VEC4_MAX_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.max_value = value
-        for regex, value in OVERRIDES["OVERRIDE_VEC4_MIN_VALUE"].items():
-            if re.search(regex, self.data_name):
-                self.min_value = value
+        self._apply_overrides("VEC4_OVERRIDES")
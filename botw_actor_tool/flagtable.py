@@ -0,0 +1,814 @@
+# Breath of the Wild Actor Tool, edits actor files fin LoZ:BotW
+# Copyright (C) 2020 GingerAvalanche (chodness@gmail.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import sys
+from array import array
+from bisect import bisect_left, insort
+from oead import S32, F32
+from oead.byml import Array, Hash, from_binary
+from typing import (
+    Any,
+    Container,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from .flag import BFUFlag, BoolFlag, S32Flag, F32Flag
+from .trigram import TrigramIndex
+
+
+# the columns of FlagColumns, in the order _load_row takes them
+COLUMNS = (
+    "hashes",
+    "names",
+    "delete_revs",
+    "reset_types",
+    "bits",
+    "categories",
+    "init_values",
+    "max_values",
+    "min_values",
+)
+
+
+# bits of FlagColumns._bits
+IS_EVENT_ASSOCIATED = 0x01
+IS_ONE_TRIGGER = 0x02
+IS_PROGRAM_READABLE = 0x04
+IS_PROGRAM_WRITABLE = 0x08
+IS_SAVE = 0x10
+IS_REVIVAL = 0x20
+BOOL_MAX_VALUE = 0x40
+BOOL_MIN_VALUE = 0x80
+
+
+def array_to_bytes(a: array) -> bytes:
+    """The little endian bytes of a column, as stored in snapshots"""
+    if sys.byteorder == "big":
+        a = array(a.typecode, a)
+        a.byteswap()
+    return a.tobytes()
+
+
+def array_from_bytes(typecode: str, data: bytes) -> array:
+    a = array(typecode)
+    a.frombytes(data)
+    if sys.byteorder == "big":
+        a.byteswap()
+    return a
+
+
+class FlagTable:
+    """
+    All the flags of one type, keyed by hash. Loaded flags are kept as the
+    gamedata Hashes they came from, and only turned into flag objects once
+    they are asked for; flags that never are get written back as they were.
+
+    The table is also its own snapshot of the flags as they were loaded: the
+    first time a flag is added, removed or changed afterwards, a copy of its
+    original (or None, if it's new) is put aside. Untouched flags are shared
+    between the two states, and comparing them only has to look at the
+    flags that were touched. Flag objects handed out by get can be changed
+    directly, so a copy of each is kept until it's found to differ from it.
+
+    The hashes are also kept in a sorted list, so the flags can be written out
+    in order without sorting them on every save. A TrigramIndex of the names
+    is built the first time the table is searched.
+    """
+
+    _flag_class: type
+    _flags: Dict[int, Union[BFUFlag, Hash]]
+    _keys: List[int]
+    _revival: Set[int]
+    _orig: Dict[int, Optional[BFUFlag]]
+    _snapshots: Dict[int, BFUFlag]
+    _shards: List[bytes]
+    _shard_sizes: List[int]
+    _sources: Dict[int, Tuple[int, int]]
+    _index: Optional[TrigramIndex]
+
+    def __init__(self, flag_class: type) -> None:
+        self._flag_class = flag_class
+        self._flags = {}
+        self._keys = []
+        self._revival = set()
+        self._orig = {}
+        self._snapshots = {}
+        self._shards = []
+        self._shard_sizes = []
+        self._sources = {}
+        self._index = None
+
+    def __contains__(self, hash: int) -> bool:
+        return hash in self._flags
+
+    def __len__(self) -> int:
+        return len(self._flags)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._flags)
+
+    def get(self, hash: int) -> Optional[BFUFlag]:
+        flag = self._flags.get(hash)
+        if isinstance(flag, Hash):
+            flag = self._flag_class(flag, revival=hash in self._revival)
+            flag.set_owner(self)
+            self._flags[hash] = flag
+            self._revival.discard(hash)
+            if not hash in self._orig:
+                self._snapshots[hash] = flag.copy()
+        return flag
+
+    def _check(self, hash: int) -> None:
+        """Puts aside the original of a flag that was changed since get handed it out"""
+        snapshot = self._snapshots.get(hash)
+        if snapshot is not None and not snapshot.same_state(self._flags[hash]):
+            self._orig[hash] = self._snapshots.pop(hash)
+
+    def _save_orig(self, hash: int) -> None:
+        """Puts aside the original of a flag that is about to change"""
+        if not hash in self._orig:
+            orig = self._snapshots.pop(hash, None)
+            if orig is None:
+                flag = self._flags.get(hash)
+                if isinstance(flag, Hash):
+                    orig = self._flag_class(flag, revival=hash in self._revival)
+                elif flag is not None:
+                    orig = flag.copy()
+            self._orig[hash] = orig
+
+    def _add_keys(self, hashes: List[int]) -> None:
+        # sorting a sorted list with a run appended to it is a single merge
+        self._keys.extend(hashes)
+        self._keys.sort()
+
+    def _remove_key(self, hash: int) -> None:
+        del self._keys[bisect_left(self._keys, hash)]
+
+    def add(self, flag: BFUFlag) -> None:
+        hash = flag.hash_value
+        self._save_orig(hash)
+        self._disown(hash, flag)
+        if not hash in self._flags:
+            insort(self._keys, hash)
+        self._flags[hash] = flag
+        flag.set_owner(self)
+        if self._index is not None:
+            self._index.add(hash, flag.data_name)
+
+    def _disown(self, hash: int, new_flag: Optional[BFUFlag] = None) -> None:
+        """Detaches the flag object currently stored for a hash, unless it's new_flag"""
+        old_flag = self._flags.get(hash)
+        if isinstance(old_flag, BFUFlag) and not old_flag is new_flag:
+            old_flag.set_owner(None)
+        self._revival.discard(hash)
+        self._sources.pop(hash, None)
+        self._snapshots.pop(hash, None)
+
+    def add_Hash(self, flag: Hash, revival: bool = False) -> None:
+        """Loads a flag from a gamedata Hash as both its current and original state"""
+        hash = flag["HashValue"].v
+        if not hash in self:
+            insort(self._keys, hash)
+        self._load_Hash(flag, revival)
+
+    def _load_Hash(self, flag: Hash, revival: bool) -> None:
+        hash = flag["HashValue"].v
+        self._disown(hash)
+        self._index = None
+        self._flags[hash] = flag
+        if revival:
+            self._revival.add(hash)
+        self._orig.pop(hash, None)
+
+    def add_Hashes(
+        self, flags: Array, revival: bool = False, overwrite: bool = True, source: bytes = b""
+    ) -> None:
+        """
+        Loads every flag of a gamedata Array, skipping flags that are already in
+        the table unless overwrite is set. source is the bgdata file the Array was
+        parsed from, see get_source.
+        """
+        shard = -1
+        new_keys = []
+        for idx, flag in enumerate(flags):
+            hash = flag["HashValue"].v
+            if not hash in self:
+                new_keys.append(hash)
+            elif not overwrite:
+                continue
+            self._load_Hash(flag, revival)
+            if source:
+                if shard == -1:
+                    shard = self._add_shard(source, len(flags))
+                self._sources[hash] = (shard, idx)
+        self._add_keys(new_keys)
+
+    def _add_shard(self, source: bytes, size: int) -> int:
+        self._shards.append(source)
+        self._shard_sizes.append(size)
+        return len(self._shards) - 1
+
+    def _get_source(self, hash: int) -> Tuple[int, int]:
+        """The (shard, index) a flag was loaded from, shard is -1 if there's none"""
+        return self._sources.get(hash, (-1, 0))
+
+    def get_source(self, hashes: Sequence[int]) -> Optional[bytes]:
+        """
+        Returns the bgdata file the flags were loaded from if they are all of its
+        flags, in the same order, and none of them changed since. Writing those
+        flags out would give the file back as it was.
+        """
+        if not hashes:
+            return None
+        shard = self._get_source(hashes[0])[0]
+        if shard == -1 or not len(hashes) == self._shard_sizes[shard]:
+            return None
+        for idx, hash in enumerate(hashes):
+            self._check(hash)
+            if hash in self._orig or not self._get_source(hash) == (shard, idx):
+                return None
+        return self._shards[shard]
+
+    def remove(self, hash: int) -> None:
+        if hash in self._flags:
+            self._save_orig(hash)
+            self._disown(hash)
+            self._flags.pop(hash)
+            self._remove_key(hash)
+            if self._index is not None:
+                self._index.remove(hash)
+
+    def flag_renamed(self, flag: BFUFlag, old_hash: int) -> None:
+        """Moves a flag of the table that was renamed, like removing it and adding it again"""
+        self.remove(old_hash)
+        self.add(flag)
+
+    def get_dirty(self) -> Iterable[int]:
+        """The hashes that were added, removed or changed since loading"""
+        for hash in list(self._snapshots):
+            self._check(hash)
+        return self._orig.keys()
+
+    def has_orig(self, hash: int) -> bool:
+        """Returns True if the flag was there when it was loaded"""
+        if hash in self._orig:
+            return self._orig[hash] is not None
+        return hash in self
+
+    def get_orig(self, hash: int) -> Optional[BFUFlag]:
+        """Returns the flag as it was loaded, None if it wasn't"""
+        self._check(hash)
+        if hash in self._orig:
+            return self._orig[hash]
+        return self.get(hash)
+
+    def get_name(self, hash: int) -> str:
+        flag = self._flags[hash]
+        if isinstance(flag, Hash):
+            return flag["DataName"]
+        return flag.data_name
+
+    def is_save(self, hash: int) -> bool:
+        flag = self._flags[hash]
+        if isinstance(flag, Hash):
+            return flag["IsSave"]
+        return flag.is_save
+
+    def is_revival(self, hash: int) -> bool:
+        flag = self._flags[hash]
+        if isinstance(flag, Hash):
+            return hash in self._revival
+        return flag.is_revival
+
+    def find_hashes(self, search: str) -> Set[int]:
+        """Returns the hashes of the flags whose name contains search"""
+        if len(search) < 3:
+            # too short to have a trigram, so the index couldn't narrow it down
+            return {hash for hash in self if search in self.get_name(hash)}
+        if self._index is None:
+            self._index = TrigramIndex((hash, self.get_name(hash)) for hash in self)
+        else:
+            # changed flags may have been renamed since they were indexed
+            for hash in self.get_dirty():
+                if hash in self:
+                    self._index.add(hash, self.get_name(hash))
+        return self._index.find(search)
+
+    def sorted_hashes(self, revival: Optional[bool] = None) -> List[int]:
+        """
+        The hashes of the flags in the order they are written out. If revival is
+        given, only flags with a matching is_revival are included.
+        """
+        if revival is None:
+            return list(self._keys)
+        return [hash for hash in self._keys if self.is_revival(hash) == revival]
+
+    def to_Hashes(self, revival: Optional[bool] = None) -> List[Hash]:
+        """Converts the flags to gamedata Hashes, see sorted_hashes"""
+        return self.hashes_to_Hashes(self.sorted_hashes(revival))
+
+    def hashes_to_Hashes(self, hashes: Iterable[int]) -> List[Hash]:
+        r = []
+        for hash in hashes:
+            flag = self._flags[hash]
+            r.append(flag if isinstance(flag, Hash) else flag.to_Hash())
+        return r
+
+    def sv_hashes(self, ignored: Container[str]) -> List[int]:
+        """The hashes of the save flags that aren't ignored, in order"""
+        return [
+            hash for hash in self._keys if self.is_save(hash) and not self.get_name(hash) in ignored
+        ]
+
+
+class FlagColumns(FlagTable):
+    """
+    A FlagTable for bool, s32 and f32 flags, which make up almost all of the
+    game's flags. Every flag is a row across parallel arrays, and a flag object
+    (a "view") is only created for a flag that is asked for. A view stays
+    attached to its row, so changes made to it are kept.
+
+    Rows loaded through add_Hashes remember the bgdata file and index they
+    came from. Writing the flags out parses those files again and passes the
+    untouched flags through, which is far cheaper than building their Hashes.
+
+    A row isn't changed until its view is written back into it, so until then
+    it doubles as the view's snapshot.
+    """
+
+    _value_type: str
+    _ftype: str
+    _rows: Dict[int, int]
+    _views: Dict[int, BFUFlag]
+    _hashes: array
+    _names: List[str]
+    _delete_revs: array
+    _reset_types: array
+    _bits: array
+    _categories: array
+    _init_values: array
+    _max_values: array
+    _min_values: array
+    _shard_ids: array
+    _shard_indices: array
+
+    def __init__(self, flag_class: type) -> None:
+        super(FlagColumns, self).__init__(flag_class)
+        if flag_class is BoolFlag:
+            self._value_type = "i"
+            self._ftype = "bool_data"
+        elif flag_class is S32Flag:
+            self._value_type = "i"
+            self._ftype = "s32_data"
+        elif flag_class is F32Flag:
+            self._value_type = "f"
+            self._ftype = "f32_data"
+        else:
+            raise ValueError(f"{flag_class.__name__} can't be stored in columns")
+        self._rows = {}
+        self._views = {}
+        self._hashes = array("i")
+        self._names = []
+        self._delete_revs = array("i")
+        self._reset_types = array("i")
+        self._bits = array("B")
+        self._categories = array("i")
+        self._init_values = array(self._value_type)
+        self._max_values = array(self._value_type)
+        self._min_values = array(self._value_type)
+        self._shard_ids = array("i")
+        self._shard_indices = array("i")
+
+    def _columns(self) -> list:
+        return [
+            self._hashes,
+            self._names,
+            self._delete_revs,
+            self._reset_types,
+            self._bits,
+            self._categories,
+            self._init_values,
+            self._max_values,
+            self._min_values,
+            self._shard_ids,
+            self._shard_indices,
+        ]
+
+    def __contains__(self, hash: int) -> bool:
+        return hash in self._rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._rows)
+
+    def _new_row(self, hash: int) -> int:
+        row = self._rows.get(hash)
+        if row is None:
+            row = len(self._hashes)
+            self._rows[hash] = row
+            for column in self._columns():
+                column.append(0 if not column is self._names else "")
+        return row
+
+    def _flag_to_row(self, flag: BFUFlag) -> tuple:
+        """The values of a flag's row, in the order of COLUMNS after hashes"""
+        bits = (
+            (IS_EVENT_ASSOCIATED if flag.is_event_associated else 0)
+            | (IS_ONE_TRIGGER if flag.is_one_trigger else 0)
+            | (IS_PROGRAM_READABLE if flag.is_program_readable else 0)
+            | (IS_PROGRAM_WRITABLE if flag.is_program_writable else 0)
+            | (IS_SAVE if flag.is_save else 0)
+            | (IS_REVIVAL if flag.is_revival else 0)
+        )
+        if isinstance(flag, BoolFlag):
+            bits |= (BOOL_MAX_VALUE if flag.max_value else 0) | (
+                BOOL_MIN_VALUE if flag.min_value else 0
+            )
+            category = flag.category
+            max_value = min_value = 0
+        else:
+            category = -1
+            max_value = flag.max_value
+            min_value = flag.min_value
+        return (
+            flag.data_name,
+            flag.delete_rev,
+            flag.reset_type,
+            bits,
+            category,
+            flag.init_value,
+            max_value,
+            min_value,
+        )
+
+    def _row_values(self, row: int) -> tuple:
+        return tuple(column[row] for column in self._columns()[1:9])
+
+    def _write_row(self, row: int, values: tuple) -> None:
+        for column, value in zip(self._columns()[1:9], values):
+            column[row] = value
+
+    def _sync(self, hash: int) -> int:
+        """
+        Writes a flag's view (if it has one) back into its row, returns the row.
+        If the view was changed, the row it replaces is put aside as the original.
+        """
+        row = self._rows[hash]
+        view = self._views.get(hash)
+        if view is not None:
+            values = self._flag_to_row(view)
+            if not hash in self._orig:
+                if values == self._row_values(row):
+                    return row
+                self._orig[hash] = self._read_flag(row)
+            self._write_row(row, values)
+        return row
+
+    def _check(self, hash: int) -> None:
+        if hash in self._views:
+            self._sync(hash)
+
+    def _read_flag(self, row: int) -> BFUFlag:
+        flag = self._flag_class()
+        flag.data_name = self._names[row]
+        flag.delete_rev = self._delete_revs[row]
+        flag.reset_type = self._reset_types[row]
+        bits = self._bits[row]
+        flag.is_event_associated = bool(bits & IS_EVENT_ASSOCIATED)
+        flag.is_one_trigger = bool(bits & IS_ONE_TRIGGER)
+        flag.is_program_readable = bool(bits & IS_PROGRAM_READABLE)
+        flag.is_program_writable = bool(bits & IS_PROGRAM_WRITABLE)
+        flag.is_save = bool(bits & IS_SAVE)
+        flag.init_value = self._init_values[row]
+        if isinstance(flag, BoolFlag):
+            flag.category = self._categories[row]
+            flag.max_value = bool(bits & BOOL_MAX_VALUE)
+            flag.min_value = bool(bits & BOOL_MIN_VALUE)
+        else:
+            flag.max_value = self._max_values[row]
+            flag.min_value = self._min_values[row]
+        if not isinstance(flag, F32Flag):
+            flag.is_revival = bool(bits & IS_REVIVAL)
+        return flag
+
+    def _save_orig(self, hash: int) -> None:
+        # the row is still the original, even if its view was changed
+        if not hash in self._orig:
+            row = self._rows.get(hash)
+            self._orig[hash] = self._read_flag(row) if row is not None else None
+
+    def get(self, hash: int) -> Optional[BFUFlag]:
+        if hash in self._views:
+            return self._views[hash]
+        row = self._rows.get(hash)
+        if row is None:
+            return None
+        flag = self._read_flag(row)
+        flag.set_owner(self)
+        self._views[hash] = flag
+        return flag
+
+    def add(self, flag: BFUFlag) -> None:
+        hash = flag.hash_value
+        self._save_orig(hash)
+        old_view = self._views.get(hash)
+        if old_view is not None and not old_view is flag:
+            old_view.set_owner(None)
+        if not hash in self._rows:
+            insort(self._keys, hash)
+        row = self._new_row(hash)
+        self._hashes[row] = hash
+        self._write_row(row, self._flag_to_row(flag))
+        self._shard_ids[row] = -1
+        self._views[hash] = flag
+        flag.set_owner(self)
+        if self._index is not None:
+            self._index.add(hash, flag.data_name)
+
+    def add_Hash(self, flag: Hash, revival: bool = False) -> None:
+        if not flag["HashValue"].v in self._rows:
+            insort(self._keys, flag["HashValue"].v)
+        self._shard_ids[self._load_Hash(flag, revival)] = -1
+
+    def add_Hashes(
+        self, flags: Array, revival: bool = False, overwrite: bool = True, source: bytes = b""
+    ) -> None:
+        shard = -1
+        new_keys = []
+        for idx, flag in enumerate(flags):
+            hash = flag["HashValue"].v
+            if not hash in self._rows:
+                new_keys.append(hash)
+            elif not overwrite:
+                continue
+            if source and shard == -1:
+                shard = self._add_shard(source, len(flags))
+            row = self._load_Hash(flag, revival)
+            self._shard_ids[row] = shard
+            self._shard_indices[row] = idx
+        self._add_keys(new_keys)
+
+    def _get_source(self, hash: int) -> Tuple[int, int]:
+        row = self._rows.get(hash)
+        if row is None:
+            return (-1, 0)
+        return (self._shard_ids[row], self._shard_indices[row])
+
+    def _load_Hash(self, flag: Hash, revival: bool) -> int:
+        """Writes a gamedata Hash into the flag's row, returns the row"""
+        if not BFUFlag.validate_Hash(flag) or not self._flag_class.validate_Hash(flag):
+            raise AttributeError(f"{flag['DataName']} is malformed.")
+        bits = (
+            (IS_EVENT_ASSOCIATED if flag["IsEventAssociated"] else 0)
+            | (IS_ONE_TRIGGER if flag["IsOneTrigger"] else 0)
+            | (IS_PROGRAM_READABLE if flag["IsProgramReadable"] else 0)
+            | (IS_PROGRAM_WRITABLE if flag["IsProgramWritable"] else 0)
+            | (IS_SAVE if flag["IsSave"] else 0)
+        )
+        if not self._flag_class is F32Flag and revival:
+            bits |= IS_REVIVAL
+        if self._flag_class is BoolFlag:
+            bits |= (BOOL_MAX_VALUE if flag["MaxValue"] else 0) | (
+                BOOL_MIN_VALUE if flag["MinValue"] else 0
+            )
+            category = flag["Category"].v if "Category" in flag else -1
+            max_value = min_value = 0
+        else:
+            category = -1
+            max_value = flag["MaxValue"].v
+            min_value = flag["MinValue"].v
+        return self._load_row(
+            flag["HashValue"].v,
+            flag["DataName"],
+            flag["DeleteRev"].v,
+            flag["ResetType"].v,
+            bits,
+            category,
+            flag["InitValue"].v,
+            max_value,
+            min_value,
+        )
+
+    def _load_row(
+        self,
+        hash: int,
+        name: str,
+        delete_rev: int,
+        reset_type: int,
+        bits: int,
+        category: int,
+        init_value: Union[int, float],
+        max_value: Union[int, float],
+        min_value: Union[int, float],
+    ) -> int:
+        """Loads a flag into its row as both its current and original state, returns the row"""
+        self._index = None
+        view = self._views.pop(hash, None)
+        if view is not None:
+            view.set_owner(None)
+        self._orig.pop(hash, None)
+        row = self._new_row(hash)
+        self._hashes[row] = hash
+        self._names[row] = name
+        self._delete_revs[row] = delete_rev
+        self._reset_types[row] = reset_type
+        self._bits[row] = bits
+        self._categories[row] = category
+        self._init_values[row] = init_value
+        self._max_values[row] = max_value
+        self._min_values[row] = min_value
+        return row
+
+    def export_columns(self, hashes: Optional[Sequence[int]] = None) -> Dict[str, Any]:
+        """
+        Copies of the columns named in COLUMNS, see add_columns. They have every
+        row in row order, or only the rows of hashes, in that order.
+        """
+        for hash in self._views:
+            self._sync(hash)
+        if hashes is None:
+            return {name: getattr(self, f"_{name}")[:] for name in COLUMNS}
+        rows = [self._rows[hash] for hash in hashes]
+        if rows and rows == list(range(rows[0], rows[0] + len(rows))):
+            # the rows of a file that was loaded whole are still next to each other
+            return {name: getattr(self, f"_{name}")[rows[0] : rows[-1] + 1] for name in COLUMNS}
+        r: Dict[str, Any] = {}
+        for name in COLUMNS:
+            column = getattr(self, f"_{name}")
+            values = [column[row] for row in rows]
+            r[name] = values if isinstance(column, list) else array(column.typecode, values)
+        return r
+
+    def add_columns(
+        self, columns: Dict[str, Any], overwrite: bool = True, source: bytes = b""
+    ) -> None:
+        """
+        Loads the flags of columns made by export_columns, like add_Hashes. The
+        rows must be valid flags, in the order they have in source.
+        """
+        hashes = columns["hashes"]
+        count = len(hashes)
+        if not count:
+            return
+        if self._rows.keys().isdisjoint(hashes):
+            # none of the flags are here yet, so every column is appended as a whole
+            shard = self._add_shard(source, count) if source else -1
+            start = len(self._hashes)
+            for name in COLUMNS:
+                getattr(self, f"_{name}").extend(columns[name])
+            self._shard_ids.extend(array("i", [shard]) * count)
+            self._shard_indices.extend(range(count))
+            self._rows.update(zip(hashes, range(start, start + count)))
+            if self._orig:
+                for hash in hashes:
+                    self._orig.pop(hash, None)
+            self._add_keys(list(hashes))
+            self._index = None
+            return
+        shard = -1
+        new_keys = []
+        for idx, hash in enumerate(hashes):
+            if not hash in self._rows:
+                new_keys.append(hash)
+            elif not overwrite:
+                continue
+            if source and shard == -1:
+                shard = self._add_shard(source, count)
+            row = self._load_row(hash, *(columns[name][idx] for name in COLUMNS[1:]))
+            self._shard_ids[row] = shard
+            self._shard_indices[row] = idx
+        self._add_keys(new_keys)
+
+    def remove(self, hash: int) -> None:
+        if not hash in self._rows:
+            return
+        self._save_orig(hash)
+        view = self._views.pop(hash, None)
+        if view is not None:
+            view.set_owner(None)
+        self._remove_key(hash)
+        if self._index is not None:
+            self._index.remove(hash)
+        row = self._rows.pop(hash)
+        last = len(self._hashes) - 1
+        if not row == last:
+            # move the last row into the hole so the arrays stay dense
+            for column in self._columns():
+                column[row] = column[last]
+            self._rows[self._hashes[row]] = row
+        for column in self._columns():
+            column.pop()
+
+    def get_dirty(self) -> Iterable[int]:
+        for hash in self._views:
+            self._sync(hash)
+        return self._orig.keys()
+
+    def get_name(self, hash: int) -> str:
+        if hash in self._views:
+            return self._views[hash].data_name
+        return self._names[self._rows[hash]]
+
+    def is_save(self, hash: int) -> bool:
+        if hash in self._views:
+            return self._views[hash].is_save
+        return bool(self._bits[self._rows[hash]] & IS_SAVE)
+
+    def is_revival(self, hash: int) -> bool:
+        if hash in self._views:
+            return self._views[hash].is_revival
+        return bool(self._bits[self._rows[hash]] & IS_REVIVAL)
+
+    def _row_to_Hash(self, row: int) -> Hash:
+        bits = self._bits[row]
+        r = Hash(
+            {
+                "DataName": self._names[row],
+                "DeleteRev": S32(self._delete_revs[row]),
+                "HashValue": S32(self._hashes[row]),
+                "IsEventAssociated": bool(bits & IS_EVENT_ASSOCIATED),
+                "IsOneTrigger": bool(bits & IS_ONE_TRIGGER),
+                "IsProgramReadable": bool(bits & IS_PROGRAM_READABLE),
+                "IsProgramWritable": bool(bits & IS_PROGRAM_WRITABLE),
+                "IsSave": bool(bits & IS_SAVE),
+                "ResetType": S32(self._reset_types[row]),
+            }
+        )
+        if self._flag_class is BoolFlag:
+            if not self._categories[row] == -1:
+                r["Category"] = S32(self._categories[row])
+            r["InitValue"] = S32(self._init_values[row])
+            r["MaxValue"] = bool(bits & BOOL_MAX_VALUE)
+            r["MinValue"] = bool(bits & BOOL_MIN_VALUE)
+        else:
+            value_type = S32 if self._flag_class is S32Flag else F32
+            r["InitValue"] = value_type(self._init_values[row])
+            r["MaxValue"] = value_type(self._max_values[row])
+            r["MinValue"] = value_type(self._min_values[row])
+        return r
+
+    def _parse_shard(self, shard: int) -> Array:
+        data = from_binary(self._shards[shard])
+        if not self._ftype in data:
+            raise ValueError(f"bgdata file {shard} has no {self._ftype}")
+        return data[self._ftype]
+
+    def sorted_hashes(self, revival: Optional[bool] = None) -> List[int]:
+        if revival is None:
+            return list(self._keys)
+        bits = self._bits
+        rows = self._rows
+        for hash in self._views:
+            self._sync(hash)
+        if revival:
+            return [hash for hash in self._keys if bits[rows[hash]] & IS_REVIVAL]
+        return [hash for hash in self._keys if not bits[rows[hash]] & IS_REVIVAL]
+
+    def hashes_to_Hashes(self, hashes: Iterable[int]) -> List[Hash]:
+        shards: Dict[int, Array] = {}
+        r = []
+        for hash in hashes:
+            row = self._sync(hash)
+            shard = self._shard_ids[row]
+            if shard == -1 or hash in self._orig:
+                r.append(self._row_to_Hash(row))
+                continue
+            if not shard in shards:
+                shards[shard] = self._parse_shard(shard)
+            r.append(shards[shard][self._shard_indices[row]])
+        return r
+
+    def sv_hashes(self, ignored: Container[str]) -> List[int]:
+        for hash in self._views:
+            self._sync(hash)
+        rows = self._rows
+        bits = self._bits
+        names = self._names
+        return [
+            hash
+            for hash in self._keys
+            if bits[rows[hash]] & IS_SAVE and not names[rows[hash]] in ignored
+        ]
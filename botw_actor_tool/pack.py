@@ -19,6 +19,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 from . import util
+from .rename import rename_aamp, rename_byml
 
 
 physics_ext = {
@@ -34,6 +35,9 @@ class ActorPack:
     _actorname: str
     _aampfiles: Dict[str, oead.aamp.ParameterIO]
     _bymlfiles: Dict[str, oead.byml.Hash]
+    _rawfiles: Dict[str, bytes]
+    _cache: Dict[str, Dict[bool, bytes]]
+    _sarc_cache: Dict[bool, bytes]
     _miscfiles: dict
     _info: oead.byml.Hash
     _links: Dict[str, str]
@@ -44,6 +48,9 @@ class ActorPack:
         self._actorname = ""
         self._aampfiles = {}
         self._bymlfiles = {}
+        self._rawfiles = {}
+        self._cache = {}
+        self._sarc_cache = {}
         self._miscfiles = {}
         self._info = oead.byml.Hash()
         self._links = {}
@@ -83,8 +90,7 @@ class ActorPack:
             if linkref == "Dummy":
                 continue
             filename = f"Actor/{folder}/{linkref}{ext}"
-            filedata = sarcdata.get_file(filename).data
-            self._aampfiles[link] = oead.aamp.ParameterIO.from_binary(filedata)
+            self._rawfiles[link] = bytes(sarcdata.get_file(filename).data)
             handled_filenames.add(filename)
 
         for link in util.BYML_LINK_REFS:
@@ -93,8 +99,7 @@ class ActorPack:
             if linkref == "Dummy":
                 continue
             filename = f"Actor/{folder}/{linkref}{ext}"
-            filedata = sarcdata.get_file(filename).data
-            self._bymlfiles[link] = oead.byml.from_binary(filedata)
+            self._rawfiles[link] = bytes(sarcdata.get_file(filename).data)
             handled_filenames.add(filename)
 
         for f in sarcdata.get_files():
@@ -104,21 +109,74 @@ class ActorPack:
     def get_name(self) -> str:
         return self._actorname
 
+    def _has_file(self, link: str) -> bool:
+        return link in self._rawfiles or link in self._aampfiles or link in self._bymlfiles
+
+    def _get_file(self, link: str) -> Union[oead.aamp.ParameterIO, oead.byml.Hash]:
+        """Returns the parsed file for a link, parsing the raw SARC entry on first access"""
+        if link in util.AAMP_LINK_REFS:
+            if not link in self._aampfiles:
+                self._aampfiles[link] = oead.aamp.ParameterIO.from_binary(self._rawfiles[link])
+            return self._aampfiles[link]
+        if not link in self._bymlfiles:
+            self._bymlfiles[link] = oead.byml.from_binary(self._rawfiles[link])
+        return self._bymlfiles[link]
+
+    def _modify_file(self, link: str) -> Union[oead.aamp.ParameterIO, oead.byml.Hash]:
+        """Like _get_file, but the file will be serialized again on the next save"""
+        data = self._get_file(link)
+        self._set_dirty(link)
+        return data
+
+    def _pop_file(self, link: str) -> None:
+        self._set_dirty(link)
+        self._aampfiles.pop(link, None)
+        self._bymlfiles.pop(link, None)
+
+    def _set_dirty(self, link: str) -> None:
+        """
+        Drops every serialized copy of an entry (a link or "ActorLink"),
+        along with the serialized pack as a whole
+        """
+        self._rawfiles.pop(link, None)
+        self._cache.pop(link, None)
+        self._sarc_cache.clear()
+
+    def _get_file_bytes(self, link: str, be: bool) -> bytes:
+        if link in self._rawfiles:
+            raw = self._rawfiles[link]
+            if link in util.AAMP_LINK_REFS or (raw[0:2] == b"BY") == be:
+                return raw
+        cached = self._cache.setdefault(link, {})
+        if not be in cached:
+            if link in util.AAMP_LINK_REFS:
+                cached[be] = oead.aamp.ParameterIO.to_binary(self._get_file(link))
+            else:
+                cached[be] = oead.byml.to_binary(self._get_file(link), be)
+        return cached[be]
+
     def set_name(self, name: str) -> None:
+        self._set_dirty("ActorLink")
         for link, linkref in self._links.items():
             if linkref == self._actorname:
                 self._links[link] = name
 
-        for link, value in self._aampfiles.items():
-            yaml = oead.aamp.ParameterIO.to_text(value)
-            if self._actorname in yaml:
-                new_yaml = yaml.replace(self._actorname, name)
-                self._aampfiles[link] = oead.aamp.ParameterIO.from_text(new_yaml)
-        for link, value in self._bymlfiles.items():
-            yaml = oead.byml.to_text(value)
-            if self._actorname in yaml:
-                new_yaml = yaml.replace(self._actorname, name)
-                self._bymlfiles[link] = oead.byml.from_text(new_yaml)
+        old_name = self._actorname.encode("utf-8")
+        for link in [*util.AAMP_LINK_REFS, *util.BYML_LINK_REFS]:
+            if not self._has_file(link):
+                continue
+            # BYML keeps every string and key as UTF-8, so an unparsed file whose
+            # bytes lack the name has nothing to rename. AAMP only keeps hashes of
+            # its keys, so those files are always parsed to check their key names.
+            if link in util.BYML_LINK_REFS and link in self._rawfiles:
+                if not old_name in self._rawfiles[link]:
+                    continue
+            if link in util.AAMP_LINK_REFS:
+                changed = rename_aamp(self._get_file(link), self._actorname, name, True)
+            else:
+                changed = rename_byml(self._get_file(link), self._actorname, name, True)
+            if changed:
+                self._set_dirty(link)
         for filename in [*self._miscfiles]:
             if self._actorname in filename:
                 new_filename = filename.replace(self._actorname, name)
@@ -126,7 +184,7 @@ class ActorPack:
                 self._miscfiles.pop(filename)
         self._actorname = name
         if "Armor_" in name and self._links["ModelUser"] == self._actorname:
-            self._aampfiles["ModelUser"].lists["ModelData"].lists["ModelData_0"].objects[
+            self._modify_file("ModelUser").lists["ModelData"].lists["ModelData_0"].objects[
                 "Base"
             ].params["Folder"] = oead.aamp.Parameter(
                 oead.FixedSafeString64("_".join(name.split("_")[:-1]))
@@ -138,33 +196,36 @@ class ActorPack:
     def set_link(self, link: str, linkref: str) -> None:
         old_linkref = self._links[link]
         self._links[link] = linkref
+        self._set_dirty("ActorLink")
 
         if link in util.AAMP_LINK_REFS:
-            folder, ext = util.AAMP_LINK_REFS[link]
             if old_linkref == "Dummy":
+                self._pop_file(link)
                 self._aampfiles[link] = oead.aamp.ParameterIO()
             elif linkref == "Dummy":
-                self._aampfiles.pop(link)
+                self._pop_file(link)
         elif link in util.BYML_LINK_REFS:
-            folder, ext = util.BYML_LINK_REFS[link]
             if old_linkref == "Dummy":
+                self._pop_file(link)
                 self._bymlfiles[link] = oead.byml.Hash()
             elif linkref == "Dummy":
-                self._bymlfiles.pop(link)
+                self._pop_file(link)
 
     def get_link_data(self, link: str) -> str:
         linkref = self._links[link]
         if not linkref == "Dummy":
             if link in util.AAMP_LINK_REFS:
-                return oead.aamp.ParameterIO.to_text(self._aampfiles[link])
+                return oead.aamp.ParameterIO.to_text(self._get_file(link))
             elif link in util.BYML_LINK_REFS:
-                return oead.byml.to_text(self._bymlfiles[link])
+                return oead.byml.to_text(self._get_file(link))
         return ""
 
     def set_link_data(self, link: str, data: str) -> None:
         if link in util.AAMP_LINK_REFS:
+            self._pop_file(link)
             self._aampfiles[link] = oead.aamp.ParameterIO.from_text(data)
         elif link in util.BYML_LINK_REFS:
+            self._pop_file(link)
             self._bymlfiles[link] = oead.byml.from_text(data)
 
     def get_tags(self) -> str:
@@ -172,6 +233,7 @@ class ActorPack:
 
     def set_tags(self, tags: str) -> None:
         self._tags = [tag for tag in tags.split(", ")]
+        self._set_dirty("ActorLink")
 
     def get_actorlink(self) -> oead.aamp.ParameterIO:
         actorlink = oead.aamp.ParameterIO()
@@ -190,24 +252,31 @@ class ActorPack:
         return actorlink
 
     def get_bytes(self, be: bool) -> bytes:
+        if be in self._sarc_cache:
+            return self._sarc_cache[be]
         writer = oead.SarcWriter()
         endianness = oead.Endianness.Big if be else oead.Endianness.Little
         writer.set_endianness(endianness)
 
         filename = f"Actor/ActorLink/{self._actorname}.bxml"
-        writer.files[filename] = oead.aamp.ParameterIO.to_binary(self.get_actorlink())
+        actorlink = self._cache.setdefault("ActorLink", {})
+        if not be in actorlink:
+            actorlink[be] = oead.aamp.ParameterIO.to_binary(self.get_actorlink())
+        writer.files[filename] = actorlink[be]
 
-        for link, data in self._aampfiles.items():
-            folder, ext = util.AAMP_LINK_REFS[link]
-            filename = f"Actor/{folder}/{self.get_link(link)}{ext}"
-            writer.files[filename] = oead.aamp.ParameterIO.to_binary(data)
+        # only entries that changed since the last save get serialized again
+        for link, (folder, ext) in util.AAMP_LINK_REFS.items():
+            if self._has_file(link):
+                filename = f"Actor/{folder}/{self.get_link(link)}{ext}"
+                writer.files[filename] = self._get_file_bytes(link, be)
 
-        for link, data in self._bymlfiles.items():
-            folder, ext = util.BYML_LINK_REFS[link]
-            filename = f"Actor/{folder}/{self.get_link(link)}{ext}"
-            writer.files[filename] = oead.byml.to_binary(data, be)
+        for link, (folder, ext) in util.BYML_LINK_REFS.items():
+            if self._has_file(link):
+                filename = f"Actor/{folder}/{self.get_link(link)}{ext}"
+                writer.files[filename] = self._get_file_bytes(link, be)
 
         for filename, data in self._miscfiles.items():
             writer.files[filename] = data
 
-        return writer.write()[1]
+        self._sarc_cache[be] = bytes(writer.write()[1])
+        return self._sarc_cache[be]
@@ -0,0 +1,187 @@
+# Breath of the Wild Actor Tool, edits actor files fin LoZ:BotW
+# Copyright (C) 2020 GingerAvalanche (chodness@gmail.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import oead
+import re
+from copy import copy
+from typing import Dict, Optional, Pattern, Union
+from zlib import crc32
+
+
+STRING_TYPES = (
+    oead.FixedSafeString32,
+    oead.FixedSafeString64,
+    oead.FixedSafeString256,
+)
+ROOT_HASH = crc32(b"param_root")
+# an actor name only counts where it isn't part of a longer name, i.e. where it's
+# bounded by these (or by the start or end of the string), as in a path or file name
+SEPARATORS = r"/\\.,;:|\s"
+
+
+def _name_pattern(old: str) -> Pattern:
+    return re.compile(rf"(?<![^{SEPARATORS}]){re.escape(old)}(?![^{SEPARATORS}])")
+
+
+def _replace(pattern: Pattern, string: str, new: str) -> Optional[str]:
+    """Returns string with every bounded match of pattern replaced, or None if there's none"""
+    replaced, count = pattern.subn(lambda _: new, string)
+    return replaced if count else None
+
+
+def _rename_key(
+    table: oead.aamp.NameTable,
+    key: oead.aamp.Name,
+    idx: int,
+    parent: int,
+    pattern: Pattern,
+    new: str,
+) -> Optional[str]:
+    name = table.get_name(key.hash, idx, parent)
+    if name:
+        new_name = _replace(pattern, name, new)
+        if new_name is not None:
+            table.add_name(new_name)
+            return new_name
+    return None
+
+
+def _rebuild(container, renamed: Dict[int, str]) -> None:
+    """
+    Puts the entries of a params, objects or lists map back in their original
+    order, under their new names where renamed. Entries are copied first, since
+    clearing the map invalidates references into it.
+    """
+    items = [(renamed.get(key.hash, key), copy(value)) for key, value in container.items()]
+    container.clear()
+    for key, value in items:
+        container[key] = value
+
+
+def _rename_object(
+    obj: oead.aamp.ParameterObject, parent: int, pattern: Pattern, new: str, table
+) -> bool:
+    new_params = []
+    renamed_keys: Dict[int, str] = {}
+    for idx, (key, param) in enumerate(obj.params.items()):
+        value = param.v
+        if isinstance(value, str):
+            string = _replace(pattern, value, new)
+            if string is not None:
+                new_params.append((key, oead.aamp.Parameter(string)))
+        elif isinstance(value, STRING_TYPES):
+            string = _replace(pattern, str(value), new)
+            if string is not None:
+                new_params.append((key, oead.aamp.Parameter(type(value)(string))))
+        if table:
+            new_key = _rename_key(table, key, idx, parent, pattern, new)
+            if new_key:
+                renamed_keys[key.hash] = new_key
+    for key, param in new_params:
+        obj.params[key] = param
+    if renamed_keys:
+        _rebuild(obj.params, renamed_keys)
+    return bool(new_params or renamed_keys)
+
+
+def _rename_list(
+    plist: oead.aamp.ParameterList, parent: int, pattern: Pattern, new: str, table
+) -> bool:
+    changed = False
+    renamed_objs: Dict[int, str] = {}
+    for idx, (key, obj) in enumerate(plist.objects.items()):
+        changed |= _rename_object(obj, key.hash, pattern, new, table)
+        if table:
+            new_key = _rename_key(table, key, idx, parent, pattern, new)
+            if new_key:
+                renamed_objs[key.hash] = new_key
+    renamed_lists: Dict[int, str] = {}
+    for idx, (key, child) in enumerate(plist.lists.items()):
+        changed |= _rename_list(child, key.hash, pattern, new, table)
+        if table:
+            new_key = _rename_key(table, key, idx, parent, pattern, new)
+            if new_key:
+                renamed_lists[key.hash] = new_key
+    if renamed_objs:
+        _rebuild(plist.objects, renamed_objs)
+        changed = True
+    if renamed_lists:
+        _rebuild(plist.lists, renamed_lists)
+        changed = True
+    return changed
+
+
+def rename_aamp(pio: oead.aamp.ParameterIO, old: str, new: str, rename_keys: bool = False) -> bool:
+    """
+    Replaces the name old with new in every string parameter of the
+    ParameterIO, in place. Only whole names are replaced, bounded by path or
+    extension separators, so a longer name that merely contains old is left
+    alone. With rename_keys, list/object/param names known to the default name
+    table are renamed as well, keeping their order. Returns True if anything
+    was changed.
+    """
+    table = oead.aamp.get_default_name_table() if rename_keys else None
+    return _rename_list(pio, ROOT_HASH, _name_pattern(old), new, table)
+
+
+def rename_byml(
+    node: Union[oead.byml.Hash, oead.byml.Array], old: str, new: str, rename_keys: bool = False
+) -> bool:
+    """
+    Replaces the name old with new in every string value of the Hash or Array,
+    in place, matching whole names the same way as rename_aamp. With
+    rename_keys, Hash keys are renamed as well. Returns True if anything was
+    changed.
+    """
+    return _rename_byml(node, _name_pattern(old), new, rename_keys)
+
+
+def _rename_byml(
+    node: Union[oead.byml.Hash, oead.byml.Array], pattern: Pattern, new: str, rename_keys: bool
+) -> bool:
+    changed = False
+    if isinstance(node, oead.byml.Hash):
+        new_values = []
+        renamed_keys = []
+        for key, value in node.items():
+            if isinstance(value, str):
+                string = _replace(pattern, value, new)
+                if string is not None:
+                    new_values.append((key, string))
+            elif isinstance(value, (oead.byml.Hash, oead.byml.Array)):
+                changed |= _rename_byml(value, pattern, new, rename_keys)
+            if rename_keys:
+                new_key = _replace(pattern, key, new)
+                if new_key is not None:
+                    renamed_keys.append((key, new_key))
+        for key, value in new_values:
+            node[key] = value
+        # Hash keys are always kept sorted, so there's no order to preserve
+        for key, new_key in renamed_keys:
+            node[new_key] = node[key]
+            del node[key]
+        changed |= bool(new_values or renamed_keys)
+    else:
+        for idx in range(len(node)):
+            value = node[idx]
+            if isinstance(value, str):
+                string = _replace(pattern, value, new)
+                if string is not None:
+                    node[idx] = string
+                    changed = True
+            elif isinstance(value, (oead.byml.Hash, oead.byml.Array)):
+                changed |= _rename_byml(value, pattern, new, rename_keys)
+    return changed
@@ -0,0 +1,275 @@
+# Breath of the Wild Actor Tool, edits actor files fin LoZ:BotW
+# Copyright (C) 2020 GingerAvalanche (chodness@gmail.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Parsing every bgdata file of gamedata.ssarc and loading its flags takes most of
+# a second, and gives the same result every time for the same gamedata.ssarc. A
+# snapshot keeps the loaded bool, s32 and f32 columns of every file in a flat
+# binary file in the data dir, keyed by the hash of the gamedata.ssarc it was
+# compiled from, so FlagStore.add_flags_from_snapshot only has to copy them in.
+#
+# The game's own gamedata.ssarc gets a snapshot that is kept for good. A mod's
+# gamedata.ssarc changes with every save, so saving stores a snapshot of the
+# one it wrote, made from the columns it already has. Those leave out the bgdata
+# files, which are already in the mod's Bootup.pack, so they're only the size of
+# the columns, and only the last few are kept. A mod gamedata.ssarc without a
+# snapshot only has its files that differ from the game's compiled.
+
+import os
+from array import array
+from pathlib import Path
+from struct import Struct, error as StructError
+from typing import Any, Dict, List, Optional, Tuple
+
+import oead
+
+from . import util
+from .flagtable import COLUMNS, FlagColumns, array_from_bytes, array_to_bytes
+from .store import COLUMN_FLAG_TYPES, FLAG_MAPPING
+
+
+SNAPSHOT_MAGIC = b"BATG"
+SNAPSHOT_VERSION = 2
+# how many snapshots of mod gamedata.ssarc files are kept around
+SNAPSHOT_KEEP = 4
+# file name prefix of the snapshots of the game's own gamedata.ssarc
+VANILLA_PREFIX = "vanilla_"
+
+# magic, version, source digest, number of files
+HEADER = Struct("<4sI20sI")
+U32 = Struct("<I")
+# name length, flag type length, bgdata length, number of flags, value typecode
+# (a file without columns has 0xFFFFFFFF flags, one stored without its bgdata
+# has a bgdata length of 0xFFFFFFFF)
+FILE_HEADER = Struct("<HHIIB3x")
+NO_COLUMNS = 0xFFFFFFFF
+NO_BGDATA = 0xFFFFFFFF
+# typecodes of the columns that aren't names or values
+COLUMN_TYPES = {
+    "hashes": "i",
+    "delete_revs": "i",
+    "reset_types": "i",
+    "bits": "B",
+    "categories": "i",
+}
+
+
+def _compile_file(file: Tuple[str, bytes]) -> Tuple[str, str, bytes, Optional[Dict[str, Any]]]:
+    """Parses one (name, bgdata) file into its snapshot entry, can run in other processes"""
+    name, data = file
+    ftype = ""
+    columns = None
+    doc = oead.byml.from_binary(data)
+    if len(doc) == 1:
+        for ftype, flags in doc.items():
+            if ftype in COLUMN_FLAG_TYPES:
+                table = FlagColumns(FLAG_MAPPING[ftype])
+                table.add_Hashes(flags, revival=bool("revival" in name))
+                columns = table.export_columns()
+    return (name, ftype, data, columns)
+
+
+class GamedataSnapshot:
+    """
+    The flags of one gamedata.ssarc, as (name, flag type, bgdata, columns) per
+    bgdata file. Columns are those of FlagColumns.export_columns, or None for
+    flag types that aren't stored in columns.
+    """
+
+    digest: str
+    files: List[Tuple[str, str, bytes, Optional[Dict[str, Any]]]]
+
+    def __init__(
+        self,
+        digest: str,
+        files: Optional[List[Tuple[str, str, bytes, Optional[Dict[str, Any]]]]] = None,
+    ) -> None:
+        self.digest = digest
+        self.files = files if files is not None else []
+
+    @classmethod
+    def compile(
+        cls, gamedata_sarc: oead.Sarc, digest: str, workers: Optional[int] = None
+    ) -> "GamedataSnapshot":
+        files = [(f.name, bytes(f.data)) for f in gamedata_sarc.get_files()]
+        return cls(digest, util.map_processes(_compile_file, files, workers))
+
+    @staticmethod
+    def get_dir() -> Path:
+        snapshot_dir = util.BatSettings().get_data_dir() / "gamedata_snapshot"
+        snapshot_dir.mkdir(parents=True, exist_ok=True)
+        return snapshot_dir
+
+    @classmethod
+    def for_vanilla(cls, workers: Optional[int] = None) -> "GamedataSnapshot":
+        """
+        Returns the snapshot of the game's own gamedata, compiling and storing it
+        first if there isn't a valid one yet
+        """
+        bootup = util.BootupPack(Path(util.find_file(Path("Pack/Bootup.pack"))))
+        digest = bootup.get_gamedata_digest()
+        path = cls.get_dir() / f"{VANILLA_PREFIX}{digest}.bin"
+        snapshot = cls.read(path, digest)
+        if snapshot is None:
+            snapshot = cls.compile(bootup.get_gamedata_sarc(), digest, workers)
+            snapshot.write(path)
+        return snapshot
+
+    @classmethod
+    def for_bootup(
+        cls, bootup: util.BootupPack, workers: Optional[int] = None
+    ) -> "GamedataSnapshot":
+        """
+        Returns the snapshot of a Bootup.pack's gamedata. If none was stored for
+        it, it's made from the vanilla snapshot, compiling only the files that
+        aren't the same as the game's.
+        """
+        digest = bootup.get_gamedata_digest()
+        snapshot = cls.read(cls.get_dir() / f"{digest}.bin", digest, bootup)
+        if snapshot is not None:
+            return snapshot
+        try:
+            vanilla = {entry[0]: entry for entry in cls.for_vanilla(workers).files}
+        except FileNotFoundError:
+            vanilla = {}
+        files = [(f.name, bytes(f.data)) for f in bootup.get_gamedata_sarc().get_files()]
+        changed = [
+            (name, data)
+            for name, data in files
+            if not name in vanilla or not vanilla[name][2] == data
+        ]
+        compiled = {
+            entry[0]: entry for entry in util.map_processes(_compile_file, changed, workers)
+        }
+        return cls(digest, [compiled.get(name) or vanilla[name] for name, _ in files])
+
+    def keep(self) -> None:
+        """
+        Stores the snapshot of a mod gamedata.ssarc where for_bootup finds it,
+        without the bgdata files, and prunes old ones
+        """
+        self.write(self.get_dir() / f"{self.digest}.bin", with_bgdata=False)
+        self.prune()
+
+    @classmethod
+    def read(
+        cls, path: Path, digest: str, bootup: Optional[util.BootupPack] = None
+    ) -> Optional["GamedataSnapshot"]:
+        """
+        Reads a snapshot, returns None if it's missing, broken or not for digest.
+        A snapshot stored without its bgdata files takes them from the
+        gamedata.ssarc of bootup, and can't be read without it.
+        """
+        try:
+            return cls._from_buffer(path.read_bytes(), digest, bootup)
+        except (OSError, ValueError, StructError):
+            return None
+
+    @classmethod
+    def _from_buffer(
+        cls, data: bytes, digest: str, bootup: Optional[util.BootupPack]
+    ) -> Optional["GamedataSnapshot"]:
+        magic, version, source, num_files = HEADER.unpack_from(data, 0)
+        if not magic == SNAPSHOT_MAGIC or not version == SNAPSHOT_VERSION:
+            return None
+        if not source.hex() == digest:
+            return None
+        snapshot = cls(digest)
+        pos = HEADER.size
+        for _ in range(num_files):
+            name_len, ftype_len, data_len, count, value_type = FILE_HEADER.unpack_from(data, pos)
+            pos += FILE_HEADER.size
+            name = data[pos : pos + name_len].decode("utf-8")
+            pos += name_len
+            ftype = data[pos : pos + ftype_len].decode("utf-8")
+            pos += ftype_len
+            if data_len == NO_BGDATA:
+                bgdata_file = bootup.get_gamedata_sarc().get_file(name) if bootup else None
+                if bgdata_file is None:
+                    return None
+                bgdata = bytes(bgdata_file.data)
+            else:
+                bgdata = data[pos : pos + data_len]
+                pos += data_len
+            columns = None
+            if not count == NO_COLUMNS:
+                columns = {}
+                for column in COLUMNS:
+                    if column == "names":
+                        (names_len,) = U32.unpack_from(data, pos)
+                        pos += 4
+                        names = data[pos : pos + names_len].decode("utf-8")
+                        columns[column] = names.split("\0") if count else []
+                        pos += names_len
+                        continue
+                    typecode = COLUMN_TYPES.get(column, chr(value_type))
+                    size = array(typecode).itemsize * count
+                    columns[column] = array_from_bytes(typecode, data[pos : pos + size])
+                    pos += size
+            snapshot.files.append((name, ftype, bgdata, columns))
+        if not pos == len(data):
+            return None
+        return snapshot
+
+    def write(self, path: Path, with_bgdata: bool = True) -> None:
+        tmp_path = path.with_suffix(f".bin.{os.getpid()}.tmp")
+        with tmp_path.open("wb") as f:
+            f.write(
+                HEADER.pack(
+                    SNAPSHOT_MAGIC, SNAPSHOT_VERSION, bytes.fromhex(self.digest), len(self.files)
+                )
+            )
+            for name, ftype, data, columns in self.files:
+                name_bytes = name.encode("utf-8")
+                ftype_bytes = ftype.encode("utf-8")
+                count = len(columns["hashes"]) if columns is not None else NO_COLUMNS
+                value_type = ord(columns["init_values"].typecode) if columns is not None else 0
+                data_len = len(data) if with_bgdata else NO_BGDATA
+                f.write(
+                    FILE_HEADER.pack(len(name_bytes), len(ftype_bytes), data_len, count, value_type)
+                )
+                f.write(name_bytes)
+                f.write(ftype_bytes)
+                if with_bgdata:
+                    f.write(data)
+                if columns is None:
+                    continue
+                for column in COLUMNS:
+                    if column == "names":
+                        names = "\0".join(columns[column]).encode("utf-8")
+                        f.write(U32.pack(len(names)))
+                        f.write(names)
+                    else:
+                        f.write(array_to_bytes(columns[column]))
+        os.replace(tmp_path, path)
+
+    def prune(self) -> None:
+        """
+        Removes all but the SNAPSHOT_KEEP most recently written snapshots of mod
+        gamedata. Vanilla snapshots are kept, there's one per game dump.
+        """
+        snapshots = sorted(
+            (
+                path
+                for path in self.get_dir().glob("*.bin")
+                if not path.name.startswith(VANILLA_PREFIX)
+            ),
+            key=lambda p: p.stat().st_mtime,
+        )
+        for path in snapshots[:-SNAPSHOT_KEEP]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
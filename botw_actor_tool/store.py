@@ -14,8 +14,11 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from oead.byml import Array, Hash
-from typing import Dict, List, Set
+from heapq import merge
+from oead import S32
+from oead.byml import Array, Hash, from_binary
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Set, Union
 
 from . import BGDATA_MAPPING
 from .flag import (
@@ -37,6 +40,7 @@ from .flag import (
     Vec3ArrayFlag,
     Vec4Flag,
 )
+from .flagtable import FlagColumns, FlagTable
 
 
 FLAG_MAPPING = {
@@ -57,7 +61,9 @@ FLAG_MAPPING = {
     "vector3f_array_data": Vec3ArrayFlag,
     "vector4f_data": Vec4Flag,
 }
-IGNORED_SAVE_FLAGS = [
+# stored as FlagColumns, everything else as flag objects
+COLUMN_FLAG_TYPES = {"bool_data", "s32_data", "f32_data"}
+IGNORED_SAVE_FLAGS = {
     "AlbumPictureIndex",
     "IsGet_Obj_AmiiboItem",
     "CaptionPictSize",
@@ -112,67 +118,77 @@ IGNORED_SAVE_FLAGS = [
     "PlayReport_AudioChannel_Mono",
     "CameraUpDownReverse",
     "PlayReport_CtrlMode_Handheld",
-]
+}
 
 
 class FlagStore:
-    _store: Dict[str, Dict[int, BFUFlag]]
-    _orig_store: Dict[str, Dict[int, BFUFlag]]
+    _store: Dict[str, FlagTable]
 
     def __init__(self) -> None:
         self._store = {}
-        self._orig_store = {}
-        for ftype in FLAG_MAPPING:
-            self._store[ftype] = {}
-            self._orig_store[ftype] = {}
+        for ftype, flag_class in FLAG_MAPPING.items():
+            table_class = FlagColumns if ftype in COLUMN_FLAG_TYPES else FlagTable
+            self._store[ftype] = table_class(flag_class)
+
+    # the tables double as the original state (see FlagTable), so loading a
+    # flag stores it once for both
 
     def add_flags_from_Hash(self, name: str, data: Hash) -> None:
         is_revival = bool("revival" in name)
         for ftype, flags in data.items():
-            for flag in flags:
-                self._store[ftype][flag["HashValue"].v] = FLAG_MAPPING[ftype](
-                    flag, revival=is_revival
-                )
-                self._orig_store[ftype][flag["HashValue"].v] = FLAG_MAPPING[ftype](
-                    flag, revival=is_revival
-                )
+            self._store[ftype].add_Hashes(flags, revival=is_revival)
 
     def add_flags_from_Hash_no_overwrite(self, name: str, data: Hash) -> None:
         is_revival = bool("revival" in name)
         for ftype, flags in data.items():
-            for flag in flags:
-                if not self.find(ftype, flag["HashValue"].v).exists():
-                    self._store[ftype][flag["HashValue"].v] = FLAG_MAPPING[ftype](
-                        flag, revival=is_revival
-                    )
-                    self._orig_store[ftype][flag["HashValue"].v] = FLAG_MAPPING[ftype](
-                        flag, revival=is_revival
-                    )
+            self._store[ftype].add_Hashes(flags, revival=is_revival, overwrite=False)
+
+    def add_flags_from_bgdata(self, name: str, data: bytes) -> None:
+        self._add_bgdata(name, data, True)
+
+    def add_flags_from_bgdata_no_overwrite(self, name: str, data: bytes) -> None:
+        self._add_bgdata(name, data, False)
+
+    def add_flags_from_snapshot(self, snapshot) -> None:
+        self._add_snapshot(snapshot, True)
+
+    def add_flags_from_snapshot_no_overwrite(self, snapshot) -> None:
+        self._add_snapshot(snapshot, False)
+
+    def _add_snapshot(self, snapshot, overwrite: bool) -> None:
+        """Loads a snapshot.GamedataSnapshot, the same as loading its bgdata files"""
+        for name, ftype, data, columns in snapshot.files:
+            if columns is not None:
+                self._store[ftype].add_columns(columns, overwrite=overwrite, source=data)
+            else:
+                self._add_bgdata(name, data, overwrite)
+
+    def _add_bgdata(self, name: str, data: bytes, overwrite: bool) -> None:
+        """Loads a bgdata file, which the tables can keep to write untouched flags back"""
+        is_revival = bool("revival" in name)
+        for ftype, flags in from_binary(data).items():
+            self._store[ftype].add_Hashes(
+                flags, revival=is_revival, overwrite=overwrite, source=data
+            )
 
     def find(self, ftype: str, hash: int) -> BFUFlag:
-        if hash in self._store[ftype]:
-            return self._store[ftype][hash]
+        flag = self._store[ftype].get(hash)
+        if flag is not None:
+            return flag
         return BFUFlag()
 
     def find_all(self, ftype: str, search: str) -> List[BFUFlag]:
-        r: List[BFUFlag] = []
-        for _, flag in self._store[ftype].items():
-            if flag.name_contains(search):
-                r.append(flag)
-        return r
+        store = self._store[ftype]
+        return [store.get(hash) for hash in self.find_all_hashes(ftype, search)]
 
     def find_all_hashes(self, ftype: str, search: str) -> Set[int]:
-        r: Set[int] = set()
-        for hash, flag in self._store[ftype].items():
-            if flag.name_contains(search):
-                r.add(hash)
-        return r
+        return self._store[ftype].find_hashes(search)
 
     def add(self, ftype: str, flag: BFUFlag) -> None:
-        self._store[ftype][flag.hash_value] = flag
+        self._store[ftype].add(flag)
 
     def remove(self, ftype: str, hash: int) -> None:
-        self._store[ftype].pop(hash, None)
+        self._store[ftype].remove(hash)
 
     def get_num_new(self) -> int:
         r = 0
@@ -192,27 +208,34 @@ class FlagStore:
             r += len(self.get_deleted_ftype(ftype))
         return r
 
+    # only flags the store has seen being added, removed or changed can differ
+    # from the originals, so none of these have to look at anything else
+
     def get_new_ftype(self, ftype: str) -> Set[str]:
-        r: Set[str] = set()
-        for _, flag in self._store[ftype].items():
-            if flag.hash_value not in self._orig_store[ftype]:
-                r.add(flag.data_name)
-        return r
+        store = self._store[ftype]
+        return {
+            store.get_name(hash)
+            for hash in store.get_dirty()
+            if hash in store and not store.has_orig(hash)
+        }
 
     def get_modified_ftype(self, ftype: str) -> Set[str]:
-        r: Set[str] = set()
-        for _, flag in self._store[ftype].items():
-            if flag.hash_value in self._orig_store[ftype]:
-                if not flag == self._orig_store[ftype][flag.hash_value]:
-                    r.add(flag.data_name)
-        return r
+        store = self._store[ftype]
+        return {
+            store.get_name(hash)
+            for hash in store.get_dirty()
+            if hash in store
+            and store.has_orig(hash)
+            and not store.get(hash) == store.get_orig(hash)
+        }
 
     def get_deleted_ftype(self, ftype: str) -> Set[str]:
-        r: Set[str] = set()
-        for _, flag in self._orig_store[ftype].items():
-            if flag.hash_value not in self._store[ftype]:
-                r.add(flag.data_name)
-        return r
+        store = self._store[ftype]
+        return {
+            store.get_orig(hash).data_name
+            for hash in store.get_dirty()
+            if not hash in store and store.has_orig(hash)
+        }
 
     def get_total_changes(self) -> int:
         return self.get_num_new() + self.get_num_modified() + self.get_num_deleted()
@@ -235,12 +258,12 @@ class FlagStore:
         return r
 
     def get_new_ftype_svdata(self, ftype: str) -> Set[str]:
-        r: Set[str] = set()
-        for _, flag in self._store[ftype].items():
-            if flag.is_save:
-                if flag.hash_value not in self._orig_store[ftype]:
-                    r.add(flag.data_name)
-        return r
+        store = self._store[ftype]
+        return {
+            store.get_name(hash)
+            for hash in store.get_dirty()
+            if hash in store and store.is_save(hash) and not store.has_orig(hash)
+        }
 
     def get_modified_ftype_svdata(self, ftype: str) -> Set[str]:
         """Always returns empty because modifying anything about
@@ -248,34 +271,80 @@ class FlagStore:
         return set()
 
     def get_deleted_ftype_svdata(self, ftype: str) -> Set[str]:
-        r: Set[str] = set()
-        for _, flag in self._orig_store[ftype].items():
-            if flag.is_save:
-                if flag.hash_value not in self._store[ftype]:
-                    r.add(flag.data_name)
-        return r
+        store = self._store[ftype]
+        return {
+            store.get_orig(hash).data_name
+            for hash in store.get_dirty()
+            if not hash in store and store.has_orig(hash) and store.get_orig(hash).is_save
+        }
 
-    def flags_to_bgdata_Array(self, prefix: str) -> Array:
-        ftype = BGDATA_MAPPING[prefix]
+    @staticmethod
+    def _bgdata_revival(prefix: str) -> Optional[bool]:
         if prefix == "revival_bool_data" or prefix == "revival_s32_data":
-            flag_list = [
-                flag.to_Hash() for _, flag in self._store[ftype].items() if flag.is_revival
-            ]
+            return True
         elif prefix == "bool_data" or prefix == "s32_data":
-            flag_list = [
-                flag.to_Hash() for _, flag in self._store[ftype].items() if not flag.is_revival
-            ]
-        else:
-            flag_list = [flag.to_Hash() for _, flag in self._store[ftype].items()]
+            return False
+        return None
+
+    def flags_to_bgdata_Array(self, prefix: str) -> Array:
+        ftype = BGDATA_MAPPING[prefix]
+        return Array(self._store[ftype].to_Hashes(revival=self._bgdata_revival(prefix)))
+
+    def flags_to_bgdata_shards(self, prefix: str, shard_size: int) -> List[Union[Array, bytes]]:
+        """
+        Splits the flags of a bgdata prefix into files of shard_size flags each.
+        A file that would come out exactly like one that was loaded with
+        add_flags_from_bgdata is given as that file's bytes, the rest as Arrays.
+        """
+        table = self._store[BGDATA_MAPPING[prefix]]
+        hashes = table.sorted_hashes(revival=self._bgdata_revival(prefix))
+        r: List[Union[Array, bytes]] = []
+        for start in range(0, len(hashes), shard_size):
+            shard_hashes = hashes[start : start + shard_size]
+            source = table.get_source(shard_hashes)
+            r.append(source if source is not None else Array(table.hashes_to_Hashes(shard_hashes)))
+        return r
+
+    def bgdata_shard_columns(self, prefix: str, shard_size: int) -> List[Optional[Dict[str, Any]]]:
+        """
+        The columns (see FlagColumns.export_columns) of each file that
+        flags_to_bgdata_shards splits prefix into, or None for each file if
+        prefix's flags aren't stored in columns
+        """
+        table = self._store[BGDATA_MAPPING[prefix]]
+        hashes = table.sorted_hashes(revival=self._bgdata_revival(prefix))
+        starts = range(0, len(hashes), shard_size)
+        if not isinstance(table, FlagColumns):
+            return [None for _ in starts]
+        return [table.export_columns(hashes[start : start + shard_size]) for start in starts]
 
-        return Array(sorted(flag_list, key=lambda f: f["HashValue"]))
+    def get_svdata_changes(self) -> Dict[int, Optional[str]]:
+        """
+        For every hash that was added, removed or changed since loading, the
+        DataName its savedata entry should have now, or None if it shouldn't
+        have one
+        """
+        dirty: Set[int] = set()
+        for table in self._store.values():
+            dirty.update(table.get_dirty())
+        changes: Dict[int, Optional[str]] = dict.fromkeys(dirty)
+        for table in self._store.values():
+            for hash in dirty:
+                if hash in table and table.is_save(hash):
+                    name = table.get_name(hash)
+                    if not name in IGNORED_SAVE_FLAGS:
+                        changes[hash] = name
+        return changes
 
     def flags_to_svdata_Array(self) -> Array:
-        flag_list: list = []
-        for _, flagdict in self._store.items():
-            flag_list += [
-                flag.to_sv_Hash()
-                for _, flag in flagdict.items()
-                if flag.is_save and not flag.data_name in IGNORED_SAVE_FLAGS
+        # every table is already in hash order, so this is a single merge
+        streams = [
+            [(hash, table) for hash in table.sv_hashes(IGNORED_SAVE_FLAGS)]
+            for table in self._store.values()
+        ]
+        return Array(
+            [
+                Hash({"DataName": table.get_name(hash), "HashValue": S32(hash)})
+                for hash, table in merge(*streams, key=itemgetter(0))
             ]
-        return Array(sorted(flag_list, key=lambda f: f["HashValue"]))
+        )
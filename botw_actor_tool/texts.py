@@ -17,19 +17,21 @@
 import oead
 from pathlib import Path
 from pymsyt import Msbt
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 
 from . import util
 
 
 class ActorTexts:
     _texts: Dict[str, str]
+    _lang_texts: Dict[str, Dict[str, str]]
     _misc_texts: dict
     _actor_name: str
     _profile: str
 
     def __init__(self, pack: Path, profile: str):
         self._texts = {}
+        self._lang_texts = {}
         self._misc_texts = {}
         self._actor_name = pack.stem
         self._profile = profile
@@ -64,34 +66,122 @@ class ActorTexts:
                     if "text" in control_type:
                         self._texts[entry] = f"{self._texts[entry]}{control_type['text']}"
 
-    def set_texts(self, texts: Dict[str, str]) -> None:
-        self._texts = texts
+    def set_texts(self, texts: Dict[str, str], lang: Optional[str] = None) -> None:
+        """Sets the texts in lang, or in the language from the settings if none is given"""
+        if lang is None or lang == util.BatSettings().get_setting("lang"):
+            self._texts = texts
+        else:
+            self._lang_texts[lang] = texts
 
     def get_texts(self) -> Dict[str, str]:
         return self._texts
 
+    def get_languages(self) -> List[str]:
+        """Returns the languages there are texts for, the one from the settings first"""
+        langs = [util.BatSettings().get_setting("lang")] if self._texts else []
+        return langs + [lang for lang, texts in self._lang_texts.items() if texts]
+
     def set_actor_name(self, name: str) -> None:
         self._actor_name = name
 
-    def write(self, root_str: str, be: bool) -> None:
-        if self._texts:
-            lang = util.BatSettings().get_setting("lang")
-            text_pack = Path(f"{root_str}/Pack/Bootup_{lang}.pack")
-            text_pack_load = text_pack
-            if not text_pack.exists():
-                text_pack.parent.mkdir(parents=True, exist_ok=True)
-                text_pack.touch()
-                text_pack_load = Path(util.find_file(Path(f"Pack/Bootup_{lang}.pack")))
-            text_sarc = oead.Sarc(text_pack_load.read_bytes())
-            text_sarc_writer = oead.SarcWriter.from_sarc(text_sarc)
-            message = f"Message/Msg_{lang}.product.ssarc"
-            message_sarc = oead.Sarc(oead.yaz0.decompress(text_sarc.get_file(message).data))
-            message_sarc_writer = oead.SarcWriter.from_sarc(message_sarc)
-            msbt_name = f"ActorType/{self._profile}.msbt"
-            msyt = Msbt.from_binary(bytes(message_sarc_writer.files[msbt_name])).to_dict()
-            for key, text in self._texts.items():
-                msyt["entries"][f"{self._actor_name}_{key}"] = {"contents": [{"text": text}]}
-            message_sarc_writer.files[msbt_name] = Msbt.from_dict(msyt).to_binary(be)
-            message_bytes = message_sarc_writer.write()[1]
-            text_sarc_writer.files[message] = oead.yaz0.compress(message_bytes)
-            text_pack.write_bytes(text_sarc_writer.write()[1])
+    def write(self, root_str: str, be: bool, compression: Optional[str] = None) -> None:
+        with MessageTransaction(root_str, be, compression) as transaction:
+            transaction.add(self)
+
+    def get_message_entries(self, lang: Optional[str] = None) -> Tuple[str, Dict[str, str]]:
+        """
+        Returns the msbt of this actor's texts in lang (by default, the language
+        from the settings), and the msbt entries they go in
+        """
+        settings_lang = util.BatSettings().get_setting("lang")
+        lang = lang or settings_lang
+        texts = self._texts if lang == settings_lang else self._lang_texts.get(lang, {})
+        return (
+            f"ActorType/{self._profile}.msbt",
+            {f"{self._actor_name}_{key}": text for key, text in texts.items()},
+        )
+
+
+def build_message(root_str: str, be: bool, lang: str, msbts: Dict[str, Dict[str, str]]) -> bytes:
+    """
+    Returns the uncompressed message archive of lang with the entries of each
+    msbt in msbts set, starting from the mod's message pack if it has one
+    """
+    text_pack = Path(f"{root_str}/Pack/Bootup_{lang}.pack")
+    if not text_pack.exists():
+        text_pack = Path(util.find_file(Path(f"Pack/Bootup_{lang}.pack")))
+    text_sarc = oead.Sarc(text_pack.read_bytes())
+    message = f"Message/Msg_{lang}.product.ssarc"
+    message_sarc = oead.Sarc(oead.yaz0.decompress(text_sarc.get_file(message).data))
+    message_sarc_writer = oead.SarcWriter.from_sarc(message_sarc)
+    for msbt_name, entries in msbts.items():
+        msyt = Msbt.from_binary(bytes(message_sarc_writer.files[msbt_name])).to_dict()
+        for key, text in entries.items():
+            msyt["entries"][key] = {"contents": [{"text": text}]}
+        message_sarc_writer.files[msbt_name] = Msbt.from_dict(msyt).to_binary(be)
+    return bytes(message_sarc_writer.write()[1])
+
+
+def write_message(root_str: str, message_bytes: bytes, lang: str) -> None:
+    """Puts a compressed message archive into the mod's message pack of lang"""
+    text_pack = Path(f"{root_str}/Pack/Bootup_{lang}.pack")
+    text_pack_load = text_pack
+    if not text_pack.exists():
+        text_pack.parent.mkdir(parents=True, exist_ok=True)
+        text_pack.touch()
+        text_pack_load = Path(util.find_file(Path(f"Pack/Bootup_{lang}.pack")))
+    text_sarc_writer = oead.SarcWriter.from_sarc(oead.Sarc(text_pack_load.read_bytes()))
+    text_sarc_writer.files[f"Message/Msg_{lang}.product.ssarc"] = message_bytes
+    text_pack.write_bytes(text_sarc_writer.write()[1])
+
+
+class MessageTransaction:
+    """
+    Collects the texts of any number of actors and puts them into a mod's
+    message packs with one read-modify-write per language when committed.
+    Used as a context manager, it commits on a clean exit.
+    """
+
+    _root_dir: str
+    _be: bool
+    _compression: Optional[str]
+    _msbts: Dict[str, Dict[str, Dict[str, str]]]
+
+    def __init__(self, root_dir: str, be: bool, compression: Optional[str] = None) -> None:
+        self._root_dir = root_dir
+        self._be = be
+        self._compression = compression
+        self._msbts = {}
+
+    def __enter__(self) -> "MessageTransaction":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        if exc_type is None:
+            self.commit()
+        return False
+
+    def add(self, texts: ActorTexts) -> None:
+        """Queues the texts of an actor in every language it has texts in"""
+        for lang in texts.get_languages():
+            self.add_entries(lang, *texts.get_message_entries(lang))
+
+    def add_entries(self, lang: str, msbt_name: str, entries: Dict[str, str]) -> None:
+        self._msbts.setdefault(lang, {}).setdefault(msbt_name, {}).update(entries)
+
+    def commit(self) -> None:
+        for lang, data in self.build().items():
+            self.write(lang, util.compress(data, self._compression))
+
+    def build(self) -> Dict[str, bytes]:
+        """
+        Returns the new, uncompressed message archive of every language there
+        are texts for. Pass the compressed results to write().
+        """
+        return {
+            lang: build_message(self._root_dir, self._be, lang, msbts)
+            for lang, msbts in self._msbts.items()
+        }
+
+    def write(self, lang: str, message_bytes: bytes) -> None:
+        write_message(self._root_dir, message_bytes, lang)
@@ -0,0 +1,83 @@
+# Breath of the Wild Actor Tool, edits actor files fin LoZ:BotW
+# Copyright (C) 2020 GingerAvalanche (chodness@gmail.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+
+def trigrams(s: str) -> Set[str]:
+    return {s[i : i + 3] for i in range(len(s) - 2)}
+
+
+class TrigramIndex:
+    """
+    Maps every three-character piece of a set of names to the keys whose name
+    contains it. A substring search only has to look at the keys that have all
+    of the search's trigrams, instead of at every name.
+    """
+
+    _grams: Dict[str, Set[int]]
+    _names: Dict[int, str]
+
+    def __init__(self, names: Iterable[Tuple[int, str]] = ()) -> None:
+        self._grams = {}
+        self._names = {}
+        for key, name in names:
+            self.add(key, name)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, key: int, name: str) -> None:
+        if key in self._names:
+            if self._names[key] == name:
+                return
+            self.remove(key)
+        self._names[key] = name
+        for gram in trigrams(name):
+            self._grams.setdefault(gram, set()).add(key)
+
+    def remove(self, key: int) -> None:
+        name = self._names.pop(key, None)
+        if name is None:
+            return
+        for gram in trigrams(name):
+            keys = self._grams[gram]
+            keys.discard(key)
+            if not keys:
+                del self._grams[gram]
+
+    def candidates(self, search: str) -> Optional[Set[int]]:
+        """
+        Returns the keys whose name may contain search, a superset of the actual
+        matches. Returns None if search is too short to be looked up.
+        """
+        grams = trigrams(search)
+        if not grams:
+            return None
+        postings = sorted((self._grams.get(gram, set()) for gram in grams), key=len)
+        r = set(postings[0])
+        for keys in postings[1:]:
+            if not r:
+                break
+            r &= keys
+        return r
+
+    def find(self, search: str) -> Set[int]:
+        """Returns the keys whose name contains search"""
+        candidates = self.candidates(search)
+        if candidates is None:
+            return {key for key, name in self._names.items() if search in name}
+        return {key for key in candidates if search in self._names[key]}
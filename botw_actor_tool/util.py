@@ -14,13 +14,19 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+from bisect import bisect_left
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from hashlib import blake2b
 from math import ceil, isclose
 from pathlib import Path
 from platform import system
-from typing import Union
+from typing import Any, Callable, Dict, List, Optional, Union
 import configparser
 import os
-import wx
+import tempfile
+import threading
 
 import oead
 
@@ -135,6 +141,17 @@ BYML_LINK_REFS: dict = {
     "AIScheduleUser": ("AISchedule", ".baischedule"),
     "AnimationInfo": ("AnimationInfo", ".baniminfo"),
 }
+YAZ0_MODES = {
+    # literal-only Yaz0, no match searching at all
+    "store": None,
+    # oead compression levels, release is oead's own default
+    "fast": 6,
+    "release": 7,
+    # the smallest files, but slower than release, opt-in only
+    "max": 9,
+}
+# below this many jobs, map_processes doesn't bother with its pool
+PROCESS_MIN_ITEMS = 8
 LANGUAGES = [
     "USen",
     "EUen",
@@ -153,181 +170,452 @@ LANGUAGES = [
 ]
 
 
-def _set_dark_mode(window: wx.Window, enabled: bool) -> None:
-    if enabled:
-        bg = wx.Colour(40, 40, 40)
-        fg = wx.Colour(255, 255, 255)
-    else:
-        bg = wx.NullColour
-        fg = wx.NullColour
-    window.SetBackgroundColour(bg)
-    window.SetForegroundColour(fg)
-    for child in window.Children:
-        if isinstance(child, wx.stc.StyledTextCtrl):
-            set_stc_dark_mode(child, enabled)
-        else:
-            _set_dark_mode(child, enabled)
-    window.Refresh()
-
-
-def set_stc_dark_mode(stc: wx.stc.StyledTextCtrl, enabled: bool) -> None:
-    if enabled:
-        default = "fore:#FFFFFF"
-        line = "fore:#FFFFFF"
-        comment = "fore:#00FF00"
-        identifier = "fore:#FF0000"
-        keyword = "fore:#FFFFFF"
-        number = "fore:#FFBBBB"
-        bg = "back:#202020"
-        caret = wx.Colour(255, 255, 255)
-    else:
-        default = "fore:#000000"
-        line = "fore:#000000"
-        comment = "fore:#FF00FF"
-        identifier = "fore:#2020FF"
-        keyword = "fore:#000000"
-        number = "fore:005555"
-        bg = "back:#FFFFFF"
-        caret = wx.Colour(0, 0, 0)
-    face = "face:Consolas"
-    stc.SetLexer(wx.stc.STC_LEX_YAML)
-    stc.StyleSetSpec(wx.stc.STC_STYLE_DEFAULT, f"{default},{bg},{face}")
-    stc.StyleSetSpec(wx.stc.STC_STYLE_LINENUMBER, f"{line},{bg},{face}")
-    stc.StyleSetSpec(wx.stc.STC_YAML_DEFAULT, f"{default},{bg},{face}")
-    stc.StyleSetSpec(wx.stc.STC_YAML_COMMENT, f"{comment},{bg},{face}")
-    stc.StyleSetSpec(wx.stc.STC_YAML_IDENTIFIER, f"bold,{identifier},{bg},{face}")
-    stc.StyleSetSpec(wx.stc.STC_YAML_KEYWORD, f"{keyword},{bg},{face}")
-    stc.StyleSetSpec(wx.stc.STC_YAML_NUMBER, f"bold,{number},{bg},{face}")
-    stc.StyleSetSpec(wx.stc.STC_YAML_REFERENCE, f"{default},{bg},{face}")
-    stc.StyleSetSpec(wx.stc.STC_YAML_DOCUMENT, f"{default},{bg},{face}")
-    stc.StyleSetSpec(wx.stc.STC_YAML_TEXT, f"{default},{bg},{face}")
-    stc.StyleSetSpec(wx.stc.STC_YAML_ERROR, f"{default},{bg},{face}")
-    stc.StyleSetSpec(wx.stc.STC_YAML_OPERATOR, f"{default},{bg},{face}")
-    stc.SetCaretForeground(caret)
-
-
-def get_gamedata_sarc(bootup_path: Path) -> oead.Sarc:
-    bootup_sarc = oead.Sarc(bootup_path.read_bytes())
-    gamedata_sarc = oead.Sarc(
-        oead.yaz0.decompress(bootup_sarc.get_file("GameData/gamedata.ssarc").data)
-    )
-    return gamedata_sarc
+class BootupPack:
+    """
+    A Bootup.pack that is read and parsed once for a whole save. The gamedata and
+    savedataformat archives are decompressed on first use, and replacement files
+    are collected until write() puts them all back in a single pass.
+    """
+
+    _path: Path
+    _data: bytes
+    _yaz: bool
+    _sarc: oead.Sarc
+    _gamedata_sarc: Optional[oead.Sarc]
+    _savedata_sarc: Optional[oead.Sarc]
+    _replacements: Dict[str, bytes]
+
+    def __init__(self, bootup_path: Path) -> None:
+        self._path = bootup_path
+        data = bootup_path.read_bytes()
+        self._yaz = data[0:4] == b"Yaz0"
+        self._data = oead.yaz0.decompress(data) if self._yaz else data
+        del data
+        self._sarc = oead.Sarc(self._data)
+        self._gamedata_sarc = None
+        self._savedata_sarc = None
+        self._replacements = {}
+
+    def get_gamedata_sarc(self) -> oead.Sarc:
+        if not self._gamedata_sarc:
+            self._gamedata_sarc = oead.Sarc(
+                oead.yaz0.decompress(self._sarc.get_file("GameData/gamedata.ssarc").data)
+            )
+        return self._gamedata_sarc
 
+    def get_gamedata_digest(self) -> str:
+        """A hash of the (compressed) gamedata.ssarc, to tell whether it changed"""
+        return self.digest(self._sarc.get_file("GameData/gamedata.ssarc").data)
 
-def get_last_two_savedata_files(bootup_path) -> list:
-    bootup_sarc = oead.Sarc(bootup_path.read_bytes())
-    savedata_sarc = oead.Sarc(
-        oead.yaz0.decompress(bootup_sarc.get_file("GameData/savedataformat.ssarc").data)
-    )
-    savedata_writer = oead.SarcWriter.from_sarc(savedata_sarc)
-    idx = 0
-    files = []
-    while True:
-        try:
-            savedata_writer.files[f"/saveformat_{idx+2}.bgsvdata"]
-            idx += 1
-        except KeyError:
-            files.append(savedata_writer.files[f"/saveformat_{idx}.bgsvdata"])
-            files.append(savedata_writer.files[f"/saveformat_{idx+1}.bgsvdata"])
-            return files
+    @staticmethod
+    def digest(data: bytes) -> str:
+        """The hash get_gamedata_digest gives for a gamedata.ssarc of data"""
+        return blake2b(data, digest_size=20).hexdigest()
+
+    def get_savedata_sarc(self) -> oead.Sarc:
+        if not self._savedata_sarc:
+            self._savedata_sarc = oead.Sarc(
+                oead.yaz0.decompress(self._sarc.get_file("GameData/savedataformat.ssarc").data)
+            )
+        return self._savedata_sarc
+
+    def get_savedata_files(self) -> List[bytes]:
+        """Returns every saveformat_#.bgsvdata, in order"""
+        savedata_sarc = self.get_savedata_sarc()
+        files = []
+        while True:
+            f = savedata_sarc.get_file(f"/saveformat_{len(files)}.bgsvdata")
+            if not f:
+                return files
+            files.append(bytes(f.data))
+
+    def set_file(self, name: str, data: bytes) -> None:
+        self._replacements[name] = data if isinstance(data, bytes) else bytes(data)
+
+    def write(self, compression: Optional[str] = None) -> None:
+        new_sarc = oead.SarcWriter.from_sarc(self._sarc)
+        for name, data in self._replacements.items():
+            new_sarc.files[name] = data
+        new_bytes = new_sarc.write()[1]
+        del new_sarc
+        # the whole pack changes with every save, caching it would only churn the cache
+        self._path.write_bytes(
+            new_bytes if not self._yaz else compress(new_bytes, compression, cached=False)
+        )
+        del new_bytes
 
 
-def make_new_gamedata(store: FlagStore, big_endian: bool) -> bytes:
+def _convert_bgdata(data: bytes, big_endian: bool) -> bytes:
+    if (data[0:2] == b"BY") == big_endian:
+        return data
+    return bytes(oead.byml.to_binary(oead.byml.from_binary(data), big_endian))
+
+
+def make_new_gamedata(
+    store: FlagStore,
+    big_endian: bool,
+    snapshot_files: Optional[list] = None,
+    workers: Optional[int] = None,
+) -> bytes:
+    """
+    Writes the store's flags as a gamedata.ssarc. If snapshot_files is given,
+    the (name, flag type, bgdata, columns) of every file is added to it, the
+    files of a snapshot.GamedataSnapshot of the result. Loaded files that
+    need their endianness changed are converted through map_processes.
+    """
     bgwriter = oead.SarcWriter(
         endian=oead.Endianness.Big if big_endian else oead.Endianness.Little
     )
+    files: Dict[str, Union[bytes, oead.byml.Array]] = {}
+    types: Dict[str, str] = {}
+    columns: Dict[str, Any] = {}
     for prefix, data_type in BGDATA_MAPPING.items():
-        bgdata_array = store.flags_to_bgdata_Array(prefix)
-        num_files = ceil(len(bgdata_array) / 4096)
-        for idx in range(num_files):
-            start = idx * 4096
-            end = (idx + 1) * 4096
-            if end > len(bgdata_array):
-                end = len(bgdata_array)
-            bgwriter.files[f"/{prefix}_{idx}.bgdata"] = oead.byml.to_binary(
-                oead.byml.Hash({data_type: bgdata_array[start:end]}), big_endian
-            )
+        # flags are sorted by hash, so a change only shifts the files from its own
+        # onward, and the files before it come back as the bytes they were loaded from
+        shards = store.flags_to_bgdata_shards(prefix, 4096)
+        if snapshot_files is not None:
+            shard_columns = store.bgdata_shard_columns(prefix, 4096)
+        for idx, shard in enumerate(shards):
+            name = f"/{prefix}_{idx}.bgdata"
+            files[name] = shard
+            types[name] = data_type
+            if snapshot_files is not None:
+                columns[name] = shard_columns[idx]
+    # oead's Hashes can't be pickled, so only the loaded files can go to other
+    # processes, the rebuilt ones are written out here
+    loaded = [name for name, shard in files.items() if isinstance(shard, bytes)]
+    converted = dict(
+        zip(
+            loaded,
+            map_processes(
+                partial(_convert_bgdata, big_endian=big_endian),
+                [files[name] for name in loaded],
+                workers,
+            ),
+        )
+    )
+    for name, shard in files.items():
+        if name in converted:
+            data = converted[name]
+        else:
+            data = oead.byml.to_binary(oead.byml.Hash({types[name]: shard}), big_endian)
+        bgwriter.files[name] = data
+        if snapshot_files is not None:
+            snapshot_files.append((name, types[name], bytes(data), columns[name]))
     return bgwriter.write()[1]
 
 
-def make_new_savedata(store: FlagStore, big_endian: bool, orig_files: list) -> bytes:
+def _make_svdata_file(entries: list, num_files: int, big_endian: bool) -> bytes:
+    return oead.byml.to_binary(
+        oead.byml.Hash(
+            {
+                "file_list": oead.byml.Array(
+                    [
+                        {
+                            "IsCommon": False,
+                            "IsCommonAtSameAccount": False,
+                            "IsSaveSecureCode": True,
+                            "file_name": "game_data.sav",
+                        },
+                        oead.byml.Array(entries),
+                    ]
+                ),
+                "save_info": oead.byml.Array(
+                    [
+                        {
+                            "directory_num": oead.S32(num_files + 2),
+                            "is_build_machine": True,
+                            "revision": oead.S32(18203),
+                        }
+                    ]
+                ),
+            }
+        ),
+        big_endian,
+    )
+
+
+def _splice_svdata(
+    store: FlagStore, big_endian: bool, orig_chunks: List[bytes]
+) -> Optional[List[bytes]]:
+    """
+    Applies the store's save flag changes to the original saveformat files.
+    Returns None if they can't be read, or if the number of files changes,
+    since every file records it.
+    """
+    entries: list = []
+    hashes: List[int] = []
+    chunk_ends: List[int] = []
+    for chunk in orig_chunks:
+        doc = oead.byml.from_binary(chunk)
+        if not "file_list" in doc or len(doc["file_list"]) < 2:
+            return None
+        for entry in doc["file_list"][1]:
+            entries.append(entry)
+            hashes.append(entry["HashValue"].v)
+        chunk_ends.append(len(entries))
+    orig_hashes = list(hashes)
+
+    replaced = set()
+    for hash, name in sorted(store.get_svdata_changes().items()):
+        idx = bisect_left(hashes, hash)
+        if idx < len(hashes) and hashes[idx] == hash:
+            if name is None:
+                del hashes[idx]
+                del entries[idx]
+            elif not entries[idx]["DataName"] == name:
+                entries[idx] = oead.byml.Hash({"DataName": name, "HashValue": oead.S32(hash)})
+                replaced.add(hash)
+        elif name is not None:
+            hashes.insert(idx, hash)
+            entries.insert(idx, oead.byml.Hash({"DataName": name, "HashValue": oead.S32(hash)}))
+
+    num_files = ceil(len(entries) / 8192)
+    if not num_files == len(orig_chunks):
+        return None
+    r = []
+    for idx, chunk in enumerate(orig_chunks):
+        start = idx * 8192
+        end = min(start + 8192, len(entries))
+        orig_start = chunk_ends[idx - 1] if idx else 0
+        if (
+            (chunk[0:2] == b"BY") == big_endian
+            and hashes[start:end] == orig_hashes[orig_start : chunk_ends[idx]]
+            and replaced.isdisjoint(hashes[start:end])
+        ):
+            r.append(chunk)
+        else:
+            r.append(_make_svdata_file(entries[start:end], num_files, big_endian))
+    return r
+
+
+def make_new_savedata(
+    store: FlagStore, big_endian: bool, orig_files: list, orig_chunks: Optional[List[bytes]] = None
+) -> bytes:
+    """
+    Builds savedataformat.ssarc. With orig_chunks (the saveformat files
+    before orig_files), only the chunks the changed save flags land in are
+    built again, the rest are kept as they are.
+    """
     svwriter = oead.SarcWriter(
         endian=oead.Endianness.Big if big_endian else oead.Endianness.Little
     )
-    svdata_array = store.flags_to_svdata_Array()
-    num_files = ceil(len(svdata_array) / 8192)
-    for idx in range(num_files):
-        start = idx * 8192
-        end = (idx + 1) * 8192
-        if end > len(svdata_array):
-            end = len(svdata_array)
-        svwriter.files[f"/saveformat_{idx}.bgsvdata"] = oead.byml.to_binary(
-            oead.byml.Hash(
-                {
-                    "file_list": oead.byml.Array(
-                        [
-                            {
-                                "IsCommon": False,
-                                "IsCommonAtSameAccount": False,
-                                "IsSaveSecureCode": True,
-                                "file_name": "game_data.sav",
-                            },
-                            oead.byml.Array(svdata_array[start:end]),
-                        ]
-                    ),
-                    "save_info": oead.byml.Array(
-                        [
-                            {
-                                "directory_num": oead.S32(num_files + 2),
-                                "is_build_machine": True,
-                                "revision": oead.S32(18203),
-                            }
-                        ]
-                    ),
-                }
-            ),
-            big_endian,
-        )
+    files = _splice_svdata(store, big_endian, orig_chunks) if orig_chunks else None
+    if files is None:
+        svdata_array = store.flags_to_svdata_Array()
+        num_files = ceil(len(svdata_array) / 8192)
+        files = [
+            _make_svdata_file(svdata_array[start : start + 8192], num_files, big_endian)
+            for start in range(0, len(svdata_array), 8192)
+        ]
+    num_files = len(files)
+    for idx, data in enumerate(files):
+        svwriter.files[f"/saveformat_{idx}.bgsvdata"] = data
     svwriter.files[f"/saveformat_{num_files}.bgsvdata"] = orig_files[0]
     svwriter.files[f"/saveformat_{num_files+1}.bgsvdata"] = orig_files[1]
     return svwriter.write()[1]
 
 
-def inject_files_into_bootup(bootup_path: Path, files: list, datas: list):
-    sarc_data = bootup_path.read_bytes()
-    yaz = sarc_data[0:4] == b"Yaz0"
-    if yaz:
-        sarc_data = oead.yaz0.decompress(sarc_data)
-    old_sarc = oead.Sarc(sarc_data)
-    del sarc_data
-    new_sarc = oead.SarcWriter.from_sarc(old_sarc)
-    del old_sarc
-    for idx in range(len(files)):
-        new_sarc.files[files[idx]] = (
-            datas[idx] if isinstance(datas[idx], bytes) else bytes(datas[idx])
-        )
-    new_bytes = new_sarc.write()[1]
-    del new_sarc
-    bootup_path.write_bytes(new_bytes if not yaz else oead.yaz0.compress(new_bytes))
-    del new_bytes
-
-
-def inject_bytes_into_sarc(sarc: Path, name: str, data: bytes) -> None:
+def inject_files_into_sarc(
+    sarc: Path, files: Dict[str, bytes], compression: Optional[str] = None
+) -> None:
     sarc_data = sarc.read_bytes()
     yaz = sarc_data[0:4] == b"Yaz0"
     if yaz:
         sarc_data = oead.yaz0.decompress(sarc_data)
     sarc_writer = oead.SarcWriter.from_sarc(oead.Sarc(sarc_data))
     del sarc_data
-    sarc_writer.files[name] = data
+    for name, data in files.items():
+        sarc_writer.files[name] = data
     new_bytes = sarc_writer.write()[1]
     del sarc_writer
-    sarc.write_bytes(new_bytes if not yaz else oead.yaz0.compress(new_bytes))
+    sarc.write_bytes(new_bytes if not yaz else compress(new_bytes, compression))
     del new_bytes
 
 
-def unpack_oead_file(f: oead.File) -> tuple:
-    return (f.name, oead.byml.from_binary(f.data))
+class Yaz0Cache:
+    """
+    Content-addressed cache of Yaz0 output in the data dir. Blobs are keyed by
+    a hash of the uncompressed bytes, so saving an unchanged payload again
+    skips compression entirely. The least recently used blobs are evicted
+    once the cache grows past the size limit in the settings. Meant to be
+    created once per save, and safe to share between threads.
+    """
+
+    _cache_dir: Path
+    _max_size: int
+    _lock: threading.Lock
+    # blob path -> size, least recently used first, read from the dir on first write
+    _blobs: Optional["OrderedDict[Path, int]"]
+    _total: int
+
+    def __init__(self) -> None:
+        settings = BatSettings()
+        self._cache_dir = settings.get_data_dir() / "yaz0_cache"
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        self._max_size = settings.get_yaz0_cache_size() * 1024 * 1024
+        self._lock = threading.Lock()
+        self._blobs = None
+        self._total = 0
+
+    def compress(self, data: bytes, mode: str) -> bytes:
+        key = blake2b(data, digest_size=20).hexdigest()
+        # keyed by level, not mode name, so blobs stay valid if a mode's level changes
+        blob_path = self._cache_dir / f"{key}.{YAZ0_MODES.get(mode, mode)}.yaz0"
+        try:
+            compressed = blob_path.read_bytes()
+            os.utime(blob_path)
+            with self._lock:
+                if self._blobs is not None and blob_path in self._blobs:
+                    self._blobs.move_to_end(blob_path)
+            return compressed
+        except FileNotFoundError:
+            pass
+        compressed = yaz0_compress(data, mode)
+        if len(compressed) <= self._max_size:
+            # a unique temp file per call, the same payload may be compressed
+            # on two threads at once
+            with tempfile.NamedTemporaryFile(
+                dir=self._cache_dir, suffix=".tmp", delete=False
+            ) as tmp:
+                tmp.write(compressed)
+            os.replace(tmp.name, blob_path)
+            self._add(blob_path, len(compressed))
+        return compressed
+
+    def _load_blobs(self) -> "OrderedDict[Path, int]":
+        blobs = []
+        for blob in self._cache_dir.glob("*.yaz0"):
+            try:
+                stat = blob.stat()
+            except FileNotFoundError:
+                continue
+            blobs.append((stat.st_mtime, blob, stat.st_size))
+        blobs.sort()
+        self._total = sum(size for _, _, size in blobs)
+        return OrderedDict((blob, size) for _, blob, size in blobs)
+
+    def _add(self, blob_path: Path, size: int) -> None:
+        with self._lock:
+            if self._blobs is None:
+                # the new blob is already on disk, so the scan counts it
+                self._blobs = self._load_blobs()
+                if blob_path in self._blobs:
+                    self._blobs.move_to_end(blob_path)
+            else:
+                self._total += size - self._blobs.pop(blob_path, 0)
+                self._blobs[blob_path] = size
+            while self._total > self._max_size and len(self._blobs) > 1:
+                blob, old_size = self._blobs.popitem(last=False)
+                try:
+                    blob.unlink()
+                except FileNotFoundError:
+                    pass
+                self._total -= old_size
+
+
+def yaz0_store(data: bytes) -> bytes:
+    """
+    Wraps data in a valid Yaz0 container without looking for any matches:
+    every group header is 0xFF followed by eight literal bytes
+    """
+    size = len(data)
+    full, rem = divmod(size, 8)
+    groups = full + (1 if rem else 0)
+    padded = bytes(data) + bytes(groups * 8 - size)
+    out = bytearray(16 + groups * 9)
+    out[0:8] = b"Yaz0" + size.to_bytes(4, "big")
+    out[16::9] = b"\xff" * groups
+    for i in range(8):
+        out[17 + i :: 9] = padded[i::8]
+    # the last group doesn't need its padding, decompression stops at the size
+    return bytes(out[: 16 + full * 9 + (1 + rem if rem else 0)])
+
+
+def yaz0_compress(data: bytes, mode: str) -> bytes:
+    if not mode in YAZ0_MODES:
+        raise ValueError(f"{mode} is not a valid Yaz0 mode")
+    if YAZ0_MODES[mode] is None:
+        return yaz0_store(data)
+    return bytes(oead.yaz0.compress(data, level=YAZ0_MODES[mode]))
+
+
+def compress(
+    data: bytes,
+    mode: Optional[str] = None,
+    cache: Optional[Yaz0Cache] = None,
+    cached: bool = True,
+) -> bytes:
+    """
+    Yaz0 compresses data with the given mode (one of YAZ0_MODES), or with the
+    mode from the settings if none is given. Goes through cache, or a new
+    Yaz0Cache if none is given, unless cached is False.
+    """
+    mode = mode or BatSettings().get_yaz0_mode()
+    if YAZ0_MODES.get(mode, 0) is None:
+        # not worth a round trip through the cache
+        return yaz0_store(data)
+    if not cached:
+        return yaz0_compress(data, mode)
+    return (cache or Yaz0Cache()).compress(data, mode)
+
+
+def compress_all(
+    datas: List[bytes],
+    mode: Optional[str] = None,
+    workers: Optional[int] = None,
+    cached: Optional[List[bool]] = None,
+) -> List[bytes]:
+    """
+    Yaz0 compresses independent payloads concurrently, returning them in the
+    same order. Uses the worker count from the settings if none is given.
+    All payloads share one Yaz0Cache, except those that cached marks False.
+    """
+    mode = mode or BatSettings().get_yaz0_mode()
+    cache = Yaz0Cache()
+    jobs = list(zip(datas, cached or [True] * len(datas)))
+    workers = min(workers or BatSettings().get_save_workers(), len(datas))
+    if workers <= 1:
+        return [compress(data, mode, cache, use) for data, use in jobs]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda job: compress(job[0], mode, cache, job[1]), jobs))
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_workers = 0
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Returns the shared process pool, started on first use and kept for later saves"""
+    global _process_pool, _process_pool_workers
+    with _process_pool_lock:
+        if _process_pool is None or not _process_pool_workers == workers:
+            if _process_pool is not None:
+                _process_pool.shutdown(wait=False)
+            _process_pool = ProcessPoolExecutor(max_workers=workers)
+            _process_pool_workers = workers
+        return _process_pool
+
+
+def map_processes(
+    func: Callable[[Any], Any],
+    items: List[Any],
+    workers: Optional[int] = None,
+    min_items: int = PROCESS_MIN_ITEMS,
+) -> List[Any]:
+    """
+    Runs func over items in a process pool, returning the results in the same
+    order. func, items and results have to be picklable. Uses the
+    gamedata_workers setting if no worker count is given, which by default is
+    1, so nothing leaves this process unless asked to. Also runs serially with
+    fewer than min_items items, where handing them out costs more than it saves.
+    """
+    workers = workers or BatSettings().get_gamedata_workers()
+    if workers <= 1 or len(items) < min_items:
+        return [func(item) for item in items]
+    pool = _get_process_pool(workers)
+    return list(pool.map(func, items, chunksize=ceil(len(items) / (workers * 4))))
 
 
 def find_file(rel_path: Path) -> Union[Path, str]:
@@ -394,6 +682,10 @@ class BatSettings:
                         "dlc_dir": "",
                         "dark_theme": False,
                         "lang": "USen",
+                        "yaz0_cache_size": "512",
+                        "yaz0_mode": "release",
+                        "save_workers": "0",
+                        "gamedata_workers": "1",
                     },
                     "Window": {"WinPosX": "0", "WinPosY": "0", "WinHeight": "0", "WinWidth": "0"},
                 }
@@ -426,6 +718,34 @@ class BatSettings:
     def get_dark_mode(self) -> bool:
         return True if self.get_setting("dark_theme") == "True" else False
 
+    def get_yaz0_cache_size(self) -> int:
+        return int(self._settings["General"].get("yaz0_cache_size", "512"))
+
+    def set_yaz0_cache_size(self, size: int) -> None:
+        self.set_setting("yaz0_cache_size", str(size))
+
+    def get_yaz0_mode(self) -> str:
+        return self._settings["General"].get("yaz0_mode", "release")
+
+    def set_yaz0_mode(self, mode: str) -> None:
+        self.set_setting("yaz0_mode", mode)
+
+    def get_save_workers(self) -> int:
+        """0 (the default) means one worker per CPU"""
+        workers = int(self._settings["General"].get("save_workers", "0"))
+        return workers if workers > 0 else (os.cpu_count() or 1)
+
+    def set_save_workers(self, workers: int) -> None:
+        self.set_setting("save_workers", str(workers))
+
+    def get_gamedata_workers(self) -> int:
+        """1 (the default) parses gamedata in this process, 0 means one process per CPU"""
+        workers = int(self._settings["General"].get("gamedata_workers", "1"))
+        return workers if workers > 0 else (os.cpu_count() or 1)
+
+    def set_gamedata_workers(self, workers: int) -> None:
+        self.set_setting("gamedata_workers", str(workers))
+
     def get_win_pos(self) -> tuple:
         return (int(self._settings["Window"]["WinPosX"]), int(self._settings["Window"]["WinPosY"]))
 
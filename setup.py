@@ -16,7 +16,12 @@ setuptools.setup(
     url="https://github.com/GingerAvalanche/botw_actor_tool",
     include_package_data=True,
     packages=setuptools.find_packages(),
-    entry_points={"console_scripts": ["botw_actor_tool = botw_actor_tool.__main__:main"]},
+    entry_points={
+        "console_scripts": [
+            "botw_actor_tool = botw_actor_tool.__main__:main",
+            "botw_actor_tool_batch = botw_actor_tool.batch:main",
+        ]
+    },
     classifiers=[
         "Programming Language :: Python :: 3.7",
         "License :: OSI Approved :: GNU Affero General Public License v3 or later (AGPLv3+)",
@@ -0,0 +1,79 @@
+# Breath of the Wild Actor Tool, edits actor files fin LoZ:BotW
+# Copyright (C) 2020 GingerAvalanche (chodness@gmail.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import oead
+import pytest
+
+from botw_actor_tool import util
+from botw_actor_tool.pack import ActorPack
+
+
+OLD_NAME = "Obj_TestPack_A_01"
+NEW_NAME = "Obj_TestPack_B_01"
+
+
+def _write_pack(path) -> None:
+    links = {link: "Dummy" for link in [*util.AAMP_LINK_REFS, *util.BYML_LINK_REFS]}
+    links["GParamUser"] = OLD_NAME
+    links["AnimationInfo"] = OLD_NAME
+    actorlink = oead.aamp.ParameterIO()
+    actorlink.type = "xml"
+    actorlink.objects["LinkTarget"] = oead.aamp.ParameterObject()
+    for link, linkref in links.items():
+        actorlink.objects["LinkTarget"].params[link] = linkref
+
+    # the name is only in a key, which AAMP stores as a hash, so the file's
+    # bytes don't contain it
+    oead.aamp.get_default_name_table().add_name(f"Param/{OLD_NAME}")
+    gparam = oead.aamp.ParameterIO()
+    gparam.type = "xml"
+    gparam.objects["General"] = oead.aamp.ParameterObject()
+    gparam.objects["General"].params[f"Param/{OLD_NAME}"] = oead.aamp.Parameter(1)
+    gparam_bytes = bytes(oead.aamp.ParameterIO.to_binary(gparam))
+    assert not OLD_NAME.encode("utf-8") in gparam_bytes
+
+    aniinfo = oead.byml.Hash({OLD_NAME: oead.byml.Hash({"Model": f"{OLD_NAME}.bfres"})})
+
+    writer = oead.SarcWriter()
+    writer.files[f"Actor/ActorLink/{OLD_NAME}.bxml"] = oead.aamp.ParameterIO.to_binary(actorlink)
+    writer.files[f"Actor/GeneralParamList/{OLD_NAME}.bgparamlist"] = gparam_bytes
+    writer.files[f"Actor/AnimationInfo/{OLD_NAME}.baniminfo"] = oead.byml.to_binary(aniinfo, False)
+    path.write_bytes(writer.write()[1])
+
+
+@pytest.mark.parametrize("be", [False, True])
+def test_rename_ignores_parse_state(tmp_path, be):
+    path = tmp_path / f"{OLD_NAME}.sbactorpack"
+    _write_pack(path)
+
+    raw = ActorPack()
+    raw.from_actor(path)
+    raw.set_name(NEW_NAME)
+
+    parsed = ActorPack()
+    parsed.from_actor(path)
+    for link in ("GParamUser", "AnimationInfo"):
+        parsed.get_link_data(link)
+    parsed.set_name(NEW_NAME)
+
+    assert raw.get_bytes(be) == parsed.get_bytes(be)
+    sarc = oead.Sarc(raw.get_bytes(be))
+    gparam = oead.aamp.ParameterIO.from_binary(
+        sarc.get_file(f"Actor/GeneralParamList/{NEW_NAME}.bgparamlist").data
+    )
+    assert f"Param/{NEW_NAME}" in gparam.objects["General"].params
+    aniinfo = oead.byml.from_binary(sarc.get_file(f"Actor/AnimationInfo/{NEW_NAME}.baniminfo").data)
+    assert str(aniinfo[NEW_NAME]["Model"]) == f"{NEW_NAME}.bfres"